@@ -9,7 +9,7 @@ Package Structure:
 - executor: Handles execution requests from the backend
 """
 
-from .sdk import task, flow, get_registry, TaskResult, TaskState, LogCapture
+from .sdk import task, flow, run_parallel, interruptible_sleep, shutdown, get_registry, TaskResult, TaskState, LogCapture, FlowCache
 from .api import create_client, ExecutionRequest, PerfectAPIClient
 from .executor import create_execution_handler
 
@@ -17,10 +17,14 @@ __all__ = [
     # SDK - User-facing decorators and data structures
     'task',
     'flow',
+    'run_parallel',
+    'interruptible_sleep',
+    'shutdown',
     'get_registry',
     'TaskResult',
     'TaskState',
     'LogCapture',
+    'FlowCache',
 
     # API - Backend communication
     'create_client',
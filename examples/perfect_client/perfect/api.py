@@ -9,12 +9,33 @@ It handles:
 """
 
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+import concurrent.futures
+import functools
+import gzip
+import http.client
 import json
+import socket
 import time
 import threading
-from typing import Dict, List, Callable, Optional
+import queue
+from urllib.parse import urlsplit, urlencode
+from typing import Any, Dict, List, Callable, Optional, Tuple
 from dataclasses import dataclass
 
+try:
+    import orjson
+except ImportError:  # orjson is optional - fall back to the stdlib encoder
+    orjson = None
+
+
+def _dumps(obj: Any) -> bytes:
+    """Serialize obj to UTF-8 encoded JSON, using orjson when available"""
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS)
+    return json.dumps(obj).encode('utf-8')
+
 
 @dataclass
 class ExecutionRequest:
@@ -32,9 +53,18 @@ class PerfectAPIClient:
     that exposes these endpoints:
 
     - POST /api/flows - Register a flow
+    - POST /api/flows/bulk - Register several flows in one request
     - GET /api/execution-requests - Long-poll for execution requests
     - POST /api/flows/{run_id}/logs - Send logs for a running flow
+    - POST /api/flows/{run_id}/logs/bulk - Send a batch of logs for a running flow
+    - POST /api/runs/{run_id}/tasks/{index}/event - Update a task and log in one call
+    - POST /api/engine/tasks/batch-update - Update several running tasks at once
     - WebSocket /ws - Real-time bidirectional communication
+
+    Threading: one client is shared by the listener, the log flusher and every
+    running flow. requests releases the GIL while blocked on socket I/O, so
+    task threads keep running while other threads wait on the network; the
+    only GIL-bound work per call is building and encoding the request body.
     """
 
     def __init__(self, base_url: str = "http://localhost:3000"):
@@ -45,11 +75,87 @@ class PerfectAPIClient:
             base_url: The URL of the Perfect backend server
         """
         self.base_url = base_url
-        self.session = requests.Session()
+        self.session = self._create_session()
+
+        # Hot-path URLs, built once and formatted with the run ID / task index per call
+        self._logs_bulk_url = base_url + "/api/flows/{}/logs/bulk"
+        self._task_state_url = base_url + "/api/runs/{}/tasks/{}/state"
+        self._task_event_url = base_url + "/api/runs/{}/tasks/{}/event"
+        self._execution_requests_url = base_url + "/api/execution-requests"
+        self._tasks_batch_url = base_url + "/api/engine/tasks/batch-update"
+        self._batch_updates_supported = True
+        self._bulk_register_supported = True
         self._execution_callback: Optional[Callable[[ExecutionRequest], None]] = None
-        self._heartbeat_running = False
-        self._heartbeat_thread = None
         self._listening = False
+        self._stop_event = threading.Event()
+        self._poll_thread = None
+        # Connection of the in-flight long-poll, so stop_listening() can abort it
+        self._poll_conn: Optional[http.client.HTTPConnection] = None
+
+        # Log batching - send_log() only queues, a background thread delivers in bulk
+        # SimpleQueue is a C-level FIFO; producers never contend on a Python lock
+        self._log_queue = queue.SimpleQueue()
+        self._log_send_lock = threading.Lock()
+        self._log_flush_interval = 0.05  # seconds
+        self._log_batch_size = 64
+        self._log_flusher_running = False
+        self._log_flusher_thread = None
+
+    def _create_session(self) -> requests.Session:
+        """
+        Create an HTTP session with a connection pool sized for concurrent use.
+
+        The long-poll, log flusher and every running flow share the
+        session, so the pool keeps enough keep-alive connections for all of them
+        instead of the requests default of 10.
+        """
+        session = requests.Session()
+        adapter = HTTPAdapter(
+            pool_connections=4,
+            pool_maxsize=64,
+            pool_block=False,
+            # Connect errors are retried for every method (nothing reached the
+            # server). Read errors and 5xx responses are retried only for GET,
+            # since a POST may already have been applied (duplicate logs/events)
+            max_retries=Retry(
+                total=2,
+                backoff_factor=0.1,
+                status_forcelist=(502, 503, 504),
+                allowed_methods=frozenset({"GET"})
+            )
+        )
+        session.mount("http://", adapter)
+        session.mount("https://", adapter)
+        session.headers.update({
+            "Content-Type": "application/json",
+            "Connection": "keep-alive",
+            "User-Agent": "perfect-py/1.0"
+        })
+        return session
+
+    def _post_json(self, url: str, payload: Any, timeout: float = 5) -> requests.Response:
+        """
+        POST a pre-serialized JSON body.
+
+        Encoding the body ourselves skips requests' json= path and lets orjson
+        produce bytes directly. The session already sends the JSON Content-Type.
+        Bodies over 1KB (bulk logs, large flow definitions) are gzip-compressed
+        at level 1, which is nearly free and shrinks log text several times over.
+
+        Args:
+            url: Full URL to post to
+            payload: JSON-serializable request body
+            timeout: Request timeout in seconds
+
+        Returns:
+            The HTTP response
+        """
+        body = _dumps(payload)
+        headers = None
+        if len(body) > 1024:
+            body = gzip.compress(body, compresslevel=1)
+            headers = {"Content-Encoding": "gzip"}
+        return self.session.post(url, data=body, headers=headers, timeout=timeout)
 
     def register_flow(self, flow_definition: Dict, auto_trigger: bool = False, configuration: str = "development") -> Optional[Dict]:
         """
@@ -67,53 +173,246 @@ class PerfectAPIClient:
         Returns:
             The registered flow object (including 'id') if successful, None otherwise
         """
+        return self.register_flows([flow_definition], auto_trigger, configuration)[0]
+
+    def register_flows(self, flow_definitions: List[Dict], auto_trigger: bool = False, configuration: str = "development") -> List[Optional[Dict]]:
+        """
+        Register several flows with Perfect in a single request.
+
+        Falls back to registering each flow individually, in parallel, if the
+        server does not provide the bulk endpoint.
+
+        Args:
+            flow_definitions: List of flow definition dicts (see register_flow)
+            auto_trigger: If True, automatically trigger each flow after registration
+            configuration: Configuration to use when auto-triggering (default: "development")
+
+        Returns:
+            One entry per definition: the registered flow object (including 'id'),
+            or None if that flow failed to register
+        """
+        if not flow_definitions:
+            return []
+
+        if not self._bulk_register_supported:
+            return self._register_flows_individually(flow_definitions, auto_trigger, configuration)
+
         try:
-            # Add auto_trigger flag to the payload
-            payload = {
-                **flow_definition,
-                "autoTrigger": auto_trigger,
-                "autoTriggerConfig": configuration
-            }
-
-            response = self.session.post(
-                f"{self.base_url}/api/flows",
-                json=payload,
-                timeout=5
+            response = self._post_json(
+                f"{self.base_url}/api/flows/bulk",
+                {
+                    "flows": flow_definitions,
+                    "autoTrigger": auto_trigger,
+                    "autoTriggerConfig": configuration
+                }
             )
+            if response.status_code == 404:
+                self._bulk_register_supported = False
+                return self._register_flows_individually(flow_definitions, auto_trigger, configuration)
             response.raise_for_status()
+            flows = response.json().get('flows') or []
+        except requests.exceptions.RequestException as e:
+            names = ", ".join(d['name'] for d in flow_definitions)
+            print(f"[ERROR] Failed to register flows {names}: {e}")
+            return [None] * len(flow_definitions)
 
-            result = response.json()
-            flow = result.get('flow')
+        trigger_msg = f" (auto-triggering with config: {configuration})" if auto_trigger else ""
+        results = []
+        for i, flow_definition in enumerate(flow_definitions):
+            flow = flows[i] if i < len(flows) else None
+            if flow:
+                print(f"[OK] Registered flow: {flow_definition['name']}{trigger_msg}")
+            else:
+                print(f"[ERROR] Failed to register flow {flow_definition['name']}")
+            results.append(flow)
+        return results
+
+    def _register_flows_individually(self, flow_definitions: List[Dict], auto_trigger: bool, configuration: str) -> List[Optional[Dict]]:
+        """Register flows one request each, overlapping the round-trips on a small thread pool"""
+        def register(flow_definition: Dict) -> Optional[Dict]:
+            try:
+                response = self._post_json(
+                    f"{self.base_url}/api/flows",
+                    {
+                        **flow_definition,
+                        "autoTrigger": auto_trigger,
+                        "autoTriggerConfig": configuration
+                    }
+                )
+                response.raise_for_status()
+                flow = response.json().get('flow')
+
+                trigger_msg = f" (auto-triggering with config: {configuration})" if auto_trigger else ""
+                print(f"[OK] Registered flow: {flow_definition['name']}{trigger_msg}")
+                return flow
+            except requests.exceptions.RequestException as e:
+                print(f"[ERROR] Failed to register flow {flow_definition['name']}: {e}")
+                return None
 
-            trigger_msg = f" (auto-triggering with config: {configuration})" if auto_trigger else ""
-            print(f"[OK] Registered flow: {flow_definition['name']}{trigger_msg}")
-            return flow
-        except requests.exceptions.RequestException as e:
-            print(f"[ERROR] Failed to register flow {flow_definition['name']}: {e}")
-            return None
+        if len(flow_definitions) == 1:
+            return [register(flow_definitions[0])]
+        with concurrent.futures.ThreadPoolExecutor(max_workers=min(8, len(flow_definitions))) as pool:
+            return list(pool.map(register, flow_definitions))
 
     def send_log(self, run_id: str, log_message: str) -> bool:
         """
-        Send a log message to Perfect for a specific flow run.
+        Queue a log message for a specific flow run.
+
+        Logs are delivered in batches by a background thread (whatever is
+        pending when it wakes, up to 64 per request). Call flush_logs() to
+        force delivery.
 
         Args:
             run_id: The ID of the flow run
             log_message: The log message to send
 
         Returns:
-            True if log sent successfully, False otherwise
+            True once the log message is queued
         """
-        try:
-            response = self.session.post(
-                f"{self.base_url}/api/flows/{run_id}/logs",
-                json={"log": log_message},
-                timeout=5
+        self._log_queue.put((run_id, (log_message,)))
+        if not self._log_flusher_running:
+            self._start_log_flusher()
+        return True
+
+    def send_logs(self, run_id: str, log_messages: List[str]) -> bool:
+        """
+        Queue several log messages for a flow run as a single queue entry.
+
+        Args:
+            run_id: The ID of the flow run
+            log_messages: The log messages to send, in order
+
+        Returns:
+            True once the log messages are queued
+        """
+        if log_messages:
+            self._log_queue.put((run_id, log_messages))
+            if not self._log_flusher_running:
+                self._start_log_flusher()
+        return True
+
+    def flush_logs(self):
+        """
+        Deliver all queued log messages immediately.
+
+        While the flusher thread is running a marker is queued behind the
+        pending logs and this call waits until the flusher has sent everything
+        ahead of it, so delivery order always matches submission order.
+        """
+        if self._log_flusher_running:
+            delivered = threading.Event()
+            self._log_queue.put(delivered)
+            if delivered.wait(timeout=10):
+                return
+
+        with self._log_send_lock:
+            pending = []
+            delivered = []
+            while True:
+                try:
+                    item = self._log_queue.get_nowait()
+                except queue.Empty:
+                    break
+                if isinstance(item, threading.Event):
+                    delivered.append(item)
+                elif item is not None:
+                    pending.append(item)
+            self._send_queued(pending)
+        for event in delivered:
+            event.set()
+
+    def _start_log_flusher(self):
+        """Start the background log flusher thread (once)"""
+        with self._log_send_lock:
+            if self._log_flusher_running:
+                return
+            self._log_flusher_running = True
+            self._log_flusher_thread = threading.Thread(
+                target=self._log_flush_loop,
+                daemon=True
             )
-            response.raise_for_status()
-            return True
-        except requests.exceptions.RequestException as e:
-            print(f"[ERROR] Failed to send log: {e}")
-            return False
+            self._log_flusher_thread.start()
+
+    def _log_flush_loop(self):
+        """
+        Background thread that delivers queued logs in batches.
+
+        Blocks on the queue until a log arrives, then drains whatever else is
+        already pending (up to the batch size) into one request. Queue items
+        are (run_id, messages) tuples, task events queued by post_task_event()
+        (callables sent in their place among the logs), flush_logs() markers
+        (Events) to set once everything before them is sent, or None to stop.
+        """
+        # A flow still logging while close() runs can start a replacement flusher
+        # (which may consume this one's stop marker); exit once superseded
+        this_thread = threading.current_thread()
+        while self._log_flusher_running and self._log_flusher_thread is this_thread:
+            try:
+                item = self._log_queue.get(timeout=self._log_flush_interval)
+            except queue.Empty:
+                continue
+
+            pending = []
+            delivered = []
+            while True:
+                if item is None:
+                    break
+                if isinstance(item, threading.Event):
+                    delivered.append(item)
+                else:
+                    pending.append(item)
+                if len(pending) >= self._log_batch_size:
+                    break
+                try:
+                    item = self._log_queue.get_nowait()
+                except queue.Empty:
+                    break
+
+            with self._log_send_lock:
+                self._send_queued(pending)
+            for event in delivered:
+                event.set()
+
+    def _send_queued(self, items: List[Any]):
+        """
+        Send queued logs and task events in submission order.
+
+        Logs between two task events go out as one batch, so each event is
+        posted only after every log line queued before it.
+
+        Args:
+            items: (run_id, log_messages) tuples and task event callables
+        """
+        batch = []
+        for item in items:
+            if isinstance(item, tuple):
+                batch.append(item)
+            else:
+                self._send_log_batch(batch)
+                batch = []
+                item()
+        self._send_log_batch(batch)
+
+    def _send_log_batch(self, batch: List[tuple]):
+        """
+        Send a batch of queued logs, one bulk request per run.
+
+        Args:
+            batch: List of (run_id, log_messages) tuples in submission order
+        """
+        logs_by_run: Dict[str, List[str]] = {}
+        for run_id, log_messages in batch:
+            logs_by_run.setdefault(run_id, []).extend(log_messages)
+
+        for run_id, logs in logs_by_run.items():
+            try:
+                response = self._post_json(
+                    self._logs_bulk_url.format(run_id),
+                    {"logs": logs}
+                )
+                response.raise_for_status()
+            except requests.exceptions.RequestException as e:
+                print(f"[ERROR] Failed to send {len(logs)} logs: {e}")
 
     def update_task_state(self, run_id: str, task_index: int, state: str, progress: int = None, duration_ms: int = None, result: Dict = None, task_name: str = None, estimated_time: int = None, crucial_pass: bool = None) -> bool:
         """
@@ -148,10 +447,9 @@ class PerfectAPIClient:
             if crucial_pass is not None:
                 payload["crucialPass"] = crucial_pass
 
-            response = self.session.post(
-                f"{self.base_url}/api/runs/{run_id}/tasks/{task_index}/state",
-                json=payload,
-                timeout=5
+            response = self._post_json(
+                self._task_state_url.format(run_id, task_index),
+                payload
             )
             response.raise_for_status()
             return True
@@ -159,59 +457,130 @@ class PerfectAPIClient:
             print(f"[ERROR] Failed to update task state: {e}")
             return False
 
-    def complete_flow(self, run_id: str, task_count: int) -> bool:
+    def update_tasks_batch(self, tasks: List[tuple], state: str = 'RUNNING') -> bool:
         """
-        Signal that the flow has completed execution from the client side.
-        This allows the server to remove any predefined tasks that weren't executed.
+        Update the state of several running tasks in one request.
+
+        Falls back to one update_task_state() call per task if the server
+        does not provide the batch endpoint.
+
+        Args:
+            tasks: List of (run_id, task_index) tuples
+            state: The state to apply to every task (default: 'RUNNING')
+
+        Returns:
+            True if update successful, False otherwise
+        """
+        if not tasks:
+            return True
+
+        if self._batch_updates_supported:
+            try:
+                response = self._post_json(
+                    self._tasks_batch_url,
+                    {"updates": [
+                        {"runId": run_id, "taskIndex": task_index, "state": state}
+                        for run_id, task_index in tasks
+                    ]}
+                )
+                if response.status_code != 404:
+                    response.raise_for_status()
+                    return True
+                self._batch_updates_supported = False
+            except requests.exceptions.RequestException as e:
+                print(f"[ERROR] Failed to update task states: {e}")
+                return False
+
+        ok = True
+        for run_id, task_index in tasks:
+            ok = self.update_task_state(run_id, task_index, state) and ok
+        return ok
+
+    def post_task_event(self, run_id: str, task_index: int, *, state: str = None, progress: int = None, duration_ms: int = None, result: Dict = None, log: str = None, task_name: str = None, estimated_time: int = None, crucial_pass: bool = None) -> bool:
+        """
+        Update a task and append a log line to its run in a single request.
+
+        Only the fields that are set are sent. An event carrying a log line is
+        queued behind the pending logs and posted by the log flusher, so the
+        line keeps its place in the run's log order without this call waiting
+        for those logs to be delivered; flush_logs() waits for it as well.
 
         Args:
             run_id: The ID of the flow run
-            task_count: The actual number of tasks that were executed
+            task_index: The index of the task (0-based)
+            state: Optional new state ('PENDING', 'RUNNING', 'COMPLETED', 'FAILED')
+            progress: Optional progress percentage (0-100)
+            duration_ms: Optional actual duration in milliseconds
+            result: Optional task result (TaskResult.to_dict())
+            log: Optional log message to append to the run
+            task_name: Optional task name (for dynamic task creation)
+            estimated_time: Optional estimated time in ms (for dynamic task creation)
+            crucial_pass: If True, task failure fails the flow (default: True)
 
         Returns:
-            True if successful, False otherwise
+            True if the event was recorded (or queued, when it carries a log
+            line), False otherwise
         """
+        payload = {}
+        if state is not None:
+            payload["state"] = state
+        if progress is not None:
+            payload["progress"] = progress
+        if duration_ms is not None:
+            payload["durationMs"] = duration_ms
+        if result is not None:
+            payload["result"] = result
+        if log is not None:
+            payload["log"] = log
+        if task_name is not None:
+            payload["taskName"] = task_name
+        if estimated_time is not None:
+            payload["estimatedTime"] = estimated_time
+        if crucial_pass is not None:
+            payload["crucialPass"] = crucial_pass
+        url = self._task_event_url.format(run_id, task_index)
+
+        if log is None:
+            return self._send_task_event(url, payload)
+
+        self._log_queue.put(functools.partial(self._send_task_event, url, payload))
+        if not self._log_flusher_running:
+            self._start_log_flusher()
+        return True
+
+    def _send_task_event(self, url: str, payload: Dict[str, Any]) -> bool:
+        """POST a task event payload, reporting (not raising) request errors"""
         try:
-            response = self.session.post(
-                f"{self.base_url}/api/runs/{run_id}/complete",
-                json={"taskCount": task_count},
-                timeout=5
-            )
+            response = self._post_json(url, payload)
             response.raise_for_status()
             return True
         except requests.exceptions.RequestException as e:
-            print(f"[ERROR] Failed to signal flow completion: {e}")
+            print(f"[ERROR] Failed to post task event: {e}")
             return False
 
-    def send_heartbeat(self) -> bool:
+    def complete_flow(self, run_id: str, task_count: int) -> bool:
         """
-        Send a heartbeat to Perfect to signal the client is alive.
+        Signal that the flow has completed execution from the client side.
+        This allows the server to remove any predefined tasks that weren't executed.
+
+        Args:
+            run_id: The ID of the flow run
+            task_count: The actual number of tasks that were executed
 
         Returns:
-            True if heartbeat sent successfully, False otherwise
+            True if successful, False otherwise
         """
         try:
-            response = self.session.post(
-                f"{self.base_url}/api/heartbeat",
-                timeout=5
+            response = self._post_json(
+                f"{self.base_url}/api/runs/{run_id}/complete",
+                {"taskCount": task_count}
             )
             response.raise_for_status()
             return True
-        except requests.exceptions.RequestException:
-            # Silently fail - heartbeat is just a keepalive
+        except requests.exceptions.RequestException as e:
+            print(f"[ERROR] Failed to signal flow completion: {e}")
             return False
 
-    def _heartbeat_loop(self, interval: float = 3.0):
-        """
-        Background thread that sends heartbeats periodically.
-
-        Args:
-            interval: How often to send heartbeats (seconds)
-        """
-        while self._heartbeat_running:
-            self.send_heartbeat()
-            time.sleep(interval)
-
     def on_execution_request(self, callback: Callable[[ExecutionRequest], None]):
         """
         Register a callback to be called when Perfect requests flow execution.
@@ -221,83 +590,152 @@ class PerfectAPIClient:
         """
         self._execution_callback = callback
 
-    def listen_for_executions(self, poll_interval: float = 1.0):
+    def listen_for_executions(self, poll_interval: float = 1.0, max_poll_interval: float = 30.0):
         """
         Start listening for execution requests from Perfect.
-        This runs in a loop and calls the registered callback when execution is requested.
+        This blocks until stop_listening() is called and invokes the registered
+        callback whenever execution is requested.
 
         Args:
-            poll_interval: How often to poll for new requests (seconds)
+            poll_interval: How long to wait before reconnecting after an error (seconds)
+            max_poll_interval: Cap for the reconnect delay, which doubles on each
+                consecutive connection error while the backend is down (seconds)
 
         Note:
-            In production, this would use WebSockets for real-time communication
-            instead of polling. This is a simplified implementation.
+            Requests are received over HTTP long-polling: the backend holds each
+            poll open for up to 30 seconds until a job is available, so an idle
+            client issues one request every 30 seconds instead of polling.
+            The backend treats an open poll as the client's heartbeat, so no
+            separate heartbeat requests are sent.
         """
         if not self._execution_callback:
             raise ValueError("No execution callback registered. Call on_execution_request() first.")
 
         print(f"[Perfect Client] Listening for execution requests from {self.base_url}...")
-        print("[Perfect Client] Sending heartbeats every 3 seconds...")
         print("[Perfect Client] Press Ctrl+C to stop")
 
-        # Start heartbeat thread
         self._listening = True
-        self._heartbeat_running = True
-        self._heartbeat_thread = threading.Thread(
-            target=self._heartbeat_loop,
-            args=(3.0,),  # Send heartbeat every 3 seconds
+
+        # Long-poll in a dedicated daemon thread so stop_listening() returns
+        # immediately instead of waiting for an in-flight poll to finish
+        stop_event = threading.Event()
+        self._stop_event = stop_event
+        self._poll_thread = threading.Thread(
+            target=self._longpoll_loop,
+            args=(stop_event, poll_interval, max_poll_interval),
             daemon=True
         )
-        self._heartbeat_thread.start()
+        self._poll_thread.start()
 
         try:
-            while self._listening:
-                try:
-                    # Very short timeout to allow quick shutdown
-                    response = self.session.get(
-                        f"{self.base_url}/api/execution-requests",
-                        timeout=0.5  # 500ms timeout for near-instant shutdown
-                    )
-
-                    if response.status_code == 200:
-                        data = response.json()
-                        if data and 'run_id' in data:
-                            request = ExecutionRequest(
-                                run_id=data['run_id'],
-                                flow_name=data['flow_name'],
-                                configuration=data['configuration']
-                            )
-                            self._execution_callback(request)
-
-                except requests.exceptions.Timeout:
-                    # Expected - poll timeout, continue polling
-                    pass
-                except requests.exceptions.RequestException as e:
-                    if self._listening:  # Only log if still listening
-                        print(f"[Perfect Client] Connection error: {e}")
-                        print(f"[Perfect Client] Retrying in {poll_interval}s...")
-                        time.sleep(poll_interval)
-
+            # Timed waits: an untimed lock wait can't be interrupted by Ctrl+C on Windows
+            while not stop_event.wait(0.5):
+                pass
         except KeyboardInterrupt:
             print("\n[Perfect Client] Shutting down...")
         finally:
+            stop_event.set()
             self._listening = False
-            self._heartbeat_running = False
+
+    def _longpoll_loop(self, stop_event: threading.Event, poll_interval: float, max_poll_interval: float = 30.0):
+        """
+        Background thread that long-polls for execution requests.
+
+        Args:
+            stop_event: Set when the listener is stopped
+            poll_interval: How long to wait before reconnecting after an error (seconds)
+            max_poll_interval: Cap for the exponential reconnect backoff (seconds)
+        """
+        retry_delay = poll_interval
+        while not stop_event.is_set():
+            try:
+                status, body = self._poll_execution_request()
+                retry_delay = poll_interval  # Backend reachable again
+
+                # 204 No Content (or an empty body) means the poll expired idle
+                if status == 200 and body:
+                    data = json.loads(body)
+                    if data and 'run_id' in data:
+                        request = ExecutionRequest(
+                            run_id=data['run_id'],
+                            flow_name=data['flow_name'],
+                            configuration=data['configuration']
+                        )
+                        # Dispatch even if stopping: the server has already dequeued
+                        # this run, so dropping it here would lose it
+                        self._execution_callback(request)
+
+            except socket.timeout:
+                # Server never answered the long-poll; reconnect and poll again
+                self._close_poll_conn()
+                retry_delay = poll_interval
+            except (OSError, http.client.HTTPException) as e:
+                self._close_poll_conn()
+                if not stop_event.is_set():  # Aborted by stop_listening() otherwise
+                    print(f"[Perfect Client] Connection error: {e}")
+                    print(f"[Perfect Client] Retrying in {retry_delay:g}s...")
+                    stop_event.wait(retry_delay)
+                    retry_delay = min(max_poll_interval, retry_delay * 2)
+            except Exception as e:
+                print(f"[Perfect Client] Execution callback failed: {e}")
+        self._close_poll_conn()
+
+    def _poll_execution_request(self) -> Tuple[int, bytes]:
+        """
+        Issue one long-poll and return (status, body).
+
+        Uses a dedicated http.client connection rather than the shared session so
+        stop_listening() can shut down its socket: the server then drops the held
+        poll (and keeps any queued run) instead of handing it to a client that
+        is going away.
+        """
+        conn = self._poll_conn
+        if conn is None:
+            url = urlsplit(self._execution_requests_url)
+            conn_class = http.client.HTTPSConnection if url.scheme == "https" else http.client.HTTPConnection
+            # The server holds the request for up to 30s, allow a little slack
+            conn = conn_class(url.netloc, timeout=35)
+            self._poll_conn = conn
+        path = urlsplit(self._execution_requests_url).path
+        query = urlencode({"heartbeat": 1, "last_seen": int(time.time())})
+        conn.request("GET", f"{path}?{query}", headers={
+            "User-Agent": self.session.headers.get("User-Agent", "perfect-py/1.0")
+        })
+        response = conn.getresponse()
+        return response.status, response.read()
+
+    def _close_poll_conn(self):
+        """Drop the long-poll connection; the next poll reconnects"""
+        conn, self._poll_conn = self._poll_conn, None
+        if conn is not None:
+            conn.close()
 
     def stop_listening(self):
-        """Stop listening for execution requests"""
+        """
+        Stop listening for execution requests.
+
+        The session (and its warm keep-alive connections) is kept so the client
+        can keep sending logs or listen again. An in-flight long-poll is aborted
+        by shutting down its socket, so the server stops holding it and cannot
+        hand it a run after the client has stopped.
+        """
         self._listening = False
-        self._heartbeat_running = False
-        # Close session to immediately abort any ongoing requests
-        self.session.close()
-        # Create a new session for cleanup operations
-        self.session = requests.Session()
+        self._stop_event.set()
+        conn = self._poll_conn
+        if conn is not None and conn.sock is not None:
+            try:
+                conn.sock.shutdown(socket.SHUT_RDWR)
+            except OSError:
+                pass  # Already closed
 
     def close(self):
         """Close the API client and cleanup resources"""
-        self._heartbeat_running = False
-        if self._heartbeat_thread:
-            self._heartbeat_thread.join(timeout=1.0)
+        flusher = self._log_flusher_thread
+        if self._log_flusher_running:
+            self._log_flusher_running = False
+            self._log_queue.put(None)
+            flusher.join(timeout=10)
+        self.flush_logs()
         self.session.close()
 
     # Report Management API
@@ -385,6 +823,10 @@ class MockPerfectClient(PerfectAPIClient):
         print(f"[Mock] [OK] Registered flow: {flow_definition['name']}{trigger_msg}")
         return True
 
+    def register_flows(self, flow_definitions: List[Dict], auto_trigger: bool = False, configuration: str = "development") -> List[bool]:
+        """Mock bulk flow registration - stores locally"""
+        return [self.register_flow(d, auto_trigger, configuration) for d in flow_definitions]
+
     def send_log(self, run_id: str, log_message: str) -> bool:
         """Mock log sending - stores locally"""
         if run_id not in self._logs:
@@ -393,6 +835,12 @@ class MockPerfectClient(PerfectAPIClient):
         print(f"[Mock] Log: {log_message}")
         return True
 
+    def send_logs(self, run_id: str, log_messages: List[str]) -> bool:
+        """Mock batch log sending - stores locally"""
+        for log_message in log_messages:
+            self.send_log(run_id, log_message)
+        return True
+
     def update_task_state(self, run_id: str, task_index: int, state: str, progress: int = None, duration_ms: int = None, result: Dict = None) -> bool:
         """Mock task state update"""
         msg = f"[Mock] Task {task_index} state: {state}"
@@ -405,6 +853,20 @@ class MockPerfectClient(PerfectAPIClient):
         print(msg)
         return True
 
+    def update_tasks_batch(self, tasks: List[tuple], state: str = 'RUNNING') -> bool:
+        """Mock batch task state update"""
+        for run_id, task_index in tasks:
+            self.update_task_state(run_id, task_index, state)
+        return True
+
+    def post_task_event(self, run_id: str, task_index: int, *, state: str = None, progress: int = None, duration_ms: int = None, result: Dict = None, log: str = None, task_name: str = None, estimated_time: int = None, crucial_pass: bool = None) -> bool:
+        """Mock task event - logs locally and reports the state change"""
+        if log is not None:
+            self.send_log(run_id, log)
+        if state is not None:
+            self.update_task_state(run_id, task_index, state, progress, duration_ms, result)
+        return True
+
     def get_registered_flows(self) -> List[Dict]:
         """Get all registered flows (mock only)"""
         return self._registered_flows
@@ -5,7 +5,8 @@ Handles execution of flows when requested by the Perfect backend via execution r
 The actual task tracking is handled by the SDK's @task decorator.
 """
 
-import threading
+import concurrent.futures
+import os
 from typing import Callable
 
 from .api import PerfectAPIClient, ExecutionRequest
@@ -18,7 +19,7 @@ def create_execution_handler(client: PerfectAPIClient, on_flow_complete: Callabl
 
     This function creates a handler that:
     - Receives execution requests from the Perfect backend
-    - Looks up the flow function and executes it
+    - Looks up the flow function and executes it on a bounded thread pool
     - The SDK's @task and @flow decorators handle all task tracking
     - Optionally calls a callback when flows complete
 
@@ -27,24 +28,30 @@ def create_execution_handler(client: PerfectAPIClient, on_flow_complete: Callabl
         on_flow_complete: Optional callback to invoke when a flow completes (receives flow_name)
 
     Returns:
-        A function that can be passed to client.on_execution_request()
+        A function that can be passed to client.on_execution_request().
+        Call its shutdown() method when listening ends; the pool's workers are
+        not daemon threads, so interpreter exit waits for running flows.
     """
     registry = get_registry()
 
+    # Reuse worker threads across runs and cap concurrency under request bursts
+    flow_pool = concurrent.futures.ThreadPoolExecutor(
+        max_workers=(os.cpu_count() or 1) * 4,
+        thread_name_prefix='perfect-flow'
+    )
+
+    # Submitted runs that have not finished, so shutdown() can cancel queued ones
+    pending_futures = set()
+
     def threaded_handler(request: ExecutionRequest):
-        """Handler that executes flows in background threads"""
+        """Handler that executes flows on the flow thread pool"""
         def wrapped_execution():
             # Find the flow
-            flow_def = None
-            for f in registry.get_flows():
-                if f.name == request.flow_name:
-                    flow_def = f
-                    break
+            flow_def = registry.get_flow_by_name(request.flow_name)
 
             if not flow_def:
                 client.send_log(request.run_id, f"[Python Client] ❌ Flow '{request.flow_name}' not found")
-                if on_flow_complete:
-                    on_flow_complete(request.flow_name)
+                client.flush_logs()
                 return
 
             try:
@@ -55,13 +62,33 @@ def create_execution_handler(client: PerfectAPIClient, on_flow_complete: Callabl
                 client.send_log(request.run_id, f"[Python Client] ✓ Flow completed: {request.flow_name}")
             except Exception as e:
                 client.send_log(request.run_id, f"[Python Client] ❌ Flow failed: {str(e)}")
+            finally:
+                client.flush_logs()
+
+        future = flow_pool.submit(wrapped_execution)
+        pending_futures.add(future)
+        future.add_done_callback(pending_futures.discard)
+
+        # Call completion callback if provided (not for runs cancelled by shutdown)
+        if on_flow_complete:
+            def on_done(done_future: concurrent.futures.Future):
+                if not done_future.cancelled():
+                    on_flow_complete(request.flow_name)
+            future.add_done_callback(on_done)
 
-            # Call completion callback if provided
-            if on_flow_complete:
-                on_flow_complete(request.flow_name)
+    def shutdown(wait: bool = True, cancel_futures: bool = False):
+        """
+        Stop accepting new runs.
 
-        # Start execution in a separate thread
-        thread = threading.Thread(target=wrapped_execution, daemon=True)
-        thread.start()
+        Args:
+            wait: Block until running flows finish
+            cancel_futures: Drop queued runs that have not started yet
+        """
+        if cancel_futures:
+            # Done by hand: Executor.shutdown(cancel_futures=...) needs Python 3.9
+            for future in list(pending_futures):
+                future.cancel()
+        flow_pool.shutdown(wait=wait)
 
+    threaded_handler.shutdown = shutdown
     return threaded_handler
@@ -24,20 +24,43 @@ Usage:
             time.sleep(1)
 """
 
+import ast
+import concurrent.futures
 import functools
+import hashlib
+import inspect
+import io
+import itertools
+import pickle
+import re
 import sys
 import threading
 import atexit
+import contextvars
+import textwrap
 import time
-from typing import Callable, Optional, Any, List, Dict
-from dataclasses import dataclass, field, asdict
+import weakref
+from typing import Callable, Optional, Any, List, Dict, Tuple, Iterable
+from dataclasses import dataclass, field
 from enum import Enum
+from pathlib import Path
+
+import requests
+
+from perfect.api import create_client, PerfectAPIClient
+
+# Set perfect.sdk.VERBOSE = False to silence the per-call [Task]/[Flow] progress
+# lines (warnings and failures are always printed)
+VERBOSE = True
 
 
 # ============================================================================
 # Data Classes
 # ============================================================================
 
+# Drop the per-instance __dict__ where dataclasses support it (Python 3.10+)
+_DATACLASS_SLOTS = {"slots": True} if sys.version_info >= (3, 10) else {}
+
 class TaskState(Enum):
     """Execution states for tasks and flows"""
     PENDING = "PENDING"
@@ -47,7 +70,7 @@ class TaskState(Enum):
     RETRYING = "RETRYING"
 
 
-@dataclass
+@dataclass(**_DATACLASS_SLOTS)
 class TaskResult:
     """
     Result of a task execution.
@@ -62,11 +85,16 @@ class TaskResult:
     table: List[Dict[str, Any]] = field(default_factory=list)
 
     def to_dict(self) -> Dict[str, Any]:
-        """Convert to dictionary for API transmission"""
-        return asdict(self)
+        """
+        Convert to dictionary for API transmission.
+
+        Built by hand rather than with dataclasses.asdict, which deep-copies
+        every row of the table. The JSON encoder only reads the rows.
+        """
+        return {"passed": self.passed, "note": self.note, "table": self.table}
 
 
-@dataclass
+@dataclass(**_DATACLASS_SLOTS)
 class TaskDefinition:
     """Metadata for a task function"""
     name: str
@@ -76,7 +104,7 @@ class TaskDefinition:
     crucial_pass: bool = True
 
 
-@dataclass
+@dataclass(**_DATACLASS_SLOTS)
 class FlowDefinition:
     """Metadata for a flow function"""
     name: str
@@ -86,14 +114,107 @@ class FlowDefinition:
     auto_trigger: bool = False
     auto_trigger_config: str = "development"
     tags: Dict[str, str] = field(default_factory=dict)
+    _api_dict: Optional[Dict[str, Any]] = field(default=None, init=False, repr=False, compare=False)
+
+    def to_api_dict(self) -> Dict[str, Any]:
+        """
+        Convert to the API registration format.
+
+        Built once and reused; reset _api_dict to None whenever tasks change.
+        """
+        if self._api_dict is None:
+            self._api_dict = {
+                "name": self.name,
+                "description": self.description,
+                "tags": self.tags,
+                "tasks": [
+                    {
+                        "name": task.name,
+                        "description": task.description,
+                        "estimatedTime": task.estimated_time,
+                        "crucialPass": task.crucial_pass
+                    }
+                    for task in self.tasks
+                ]
+            }
+        return self._api_dict
+
+
+# ============================================================================
+# Flow Result Cache (opt-in)
+# ============================================================================
+
+_CACHE_MISS = object()
+
+
+class FlowCache:
+    """
+    Opt-in memo of flow results keyed by call arguments.
+
+    A hit returns the earlier (result, run_id) without running the flow or
+    contacting the backend. Calls whose arguments cannot be pickled, and
+    calls that raise, are never cached.
+
+    Example:
+        @flow(name="Daily ETL", cache=FlowCache(ttl=600))
+        def daily_etl(day: str):
+            ...
+    """
+
+    def __init__(self, ttl: float = 300.0):
+        """
+        Args:
+            ttl: Seconds a cached result stays valid (default: 300)
+        """
+        self.ttl = ttl
+        self._store: Dict[str, Tuple[float, Any]] = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def key(args: tuple, kwargs: dict) -> Optional[str]:
+        """Hash call arguments into a cache key (None if they cannot be pickled)"""
+        try:
+            payload = pickle.dumps((args, sorted(kwargs.items())), protocol=pickle.HIGHEST_PROTOCOL)
+        except Exception:
+            return None
+        return hashlib.blake2b(payload, digest_size=16).hexdigest()
+
+    def get(self, key: str) -> Any:
+        """Return the cached value for key, or _CACHE_MISS if absent or expired"""
+        with self._lock:
+            entry = self._store.get(key)
+            if entry is None:
+                return _CACHE_MISS
+            expires_at, value = entry
+            if time.monotonic() >= expires_at:
+                del self._store[key]
+                return _CACHE_MISS
+            return value
+
+    def put(self, key: str, value: Any):
+        """Cache value under key for ttl seconds"""
+        with self._lock:
+            self._store[key] = (time.monotonic() + self.ttl, value)
+
+    def clear(self):
+        """Drop every cached result"""
+        with self._lock:
+            self._store.clear()
 
 
 # ============================================================================
 # Log Capture (for flow execution)
 # ============================================================================
 
-# Thread-local storage for tracking which thread is running which flow
-_thread_local = threading.local()
+# Context-local slot for the active flow's log capture. Each thread starts
+# with an empty context, and asyncio tasks get their own copy, so output is
+# only captured where a flow is actually running.
+_log_capture_var: contextvars.ContextVar = contextvars.ContextVar('log_capture', default=None)
+
+# Number of captures currently started; lets stdout skip the context lookup
+# entirely while no flow is running
+_active_captures = 0
+_active_captures_lock = threading.Lock()
 
 
 class ThreadAwareStdout:
@@ -103,69 +224,145 @@ class ThreadAwareStdout:
     """
 
     def __init__(self):
-        self._lock = threading.Lock()
+        # Bound once so the pass-through path skips the sys.__stdout__ lookups
+        self._real_write = sys.__stdout__.write
+        self._real_flush = sys.__stdout__.flush
 
     def write(self, text: str):
         """Write text - capture if thread is running a flow, otherwise pass through"""
-        # Check if current thread has an active log capture
-        log_capture = getattr(_thread_local, 'log_capture', None)
+        # Only contexts running a flow have a capture set (see LogCapture.start_capture)
+        log_capture = _log_capture_var.get() if _active_captures else None
+        if log_capture is None:
+            # Normal thread - write directly to real stdout (flushed per line)
+            self._real_write(text)
+            if '\n' in text:
+                self._real_flush()
+            return
 
-        if log_capture is not None:
-            # This thread is running a flow - capture the log
-            log_capture.write(text)
-        else:
-            # Normal thread - write directly to real stdout
-            sys.__stdout__.write(text)
-            sys.__stdout__.flush()
+        # This thread is running a flow - capture the log
+        log_capture.write(text)
+
+    def writelines(self, lines):
+        """Write a sequence of strings"""
+        self.write(''.join(lines))
 
     def flush(self):
         """Flush the stream"""
-        log_capture = getattr(_thread_local, 'log_capture', None)
-        if log_capture is not None:
-            log_capture.flush()
-        sys.__stdout__.flush()
+        log_capture = _log_capture_var.get() if _active_captures else None
+        if log_capture is None:
+            self._real_flush()
+            return
+        log_capture.flush()
 
 
 class LogCapture:
-    """Captures stdout during flow execution and sends to Perfect backend"""
+    """
+    Captures stdout during flow execution and sends to Perfect backend.
+
+    Output is line-buffered: complete lines are sent as soon as they are
+    written, while a partial line is held until it is completed, grows past
+    4KB, or has been pending for more than 100ms. The buffer is only
+    allocated once there is something to send, so flows that print nothing
+    (or only empty lines) never touch it.
+    """
 
     def __init__(self, client, run_id: str):
         self.client = client
         self.run_id = run_id
-        self.buffer = ""
+        self._buf: Optional[io.StringIO] = None
+        self._pending_since = 0.0
+        self._max_buffer = 4096  # characters
+        self._flush_interval = 0.1  # seconds
         self._lock = threading.Lock()
+        self._token: Optional[contextvars.Token] = None
 
     def write(self, text: str):
         """Write text to stdout and buffer for transmission"""
-        # Always write to real stdout
+        # Always write to real stdout (flushed per line)
         sys.__stdout__.write(text)
-        sys.__stdout__.flush()
+        if '\n' in text:
+            sys.__stdout__.flush()
 
-        with self._lock:
-            self.buffer += text
+        # Bare newlines with nothing pending can only produce empty lines. Other
+        # whitespace (e.g. the separator in print(" ", x)) starts a line and is kept
+        if self._buf is None and not text.strip('\n'):
+            return
 
-            # Send complete lines as logs to the flow
-            while '\n' in self.buffer:
-                line, self.buffer = self.buffer.split('\n', 1)
-                if line.strip():
-                    self.client.send_log(self.run_id, line)
+        with self._lock:
+            if '\n' in text:
+                # One split of the new text: the buffered partial line completes
+                # the first piece, the last piece becomes the new partial line
+                lines = text.split('\n')
+                if self._buf is not None:
+                    lines[0] = self._buf.getvalue() + lines[0]
+                self._reset_buffer(lines.pop())
+            else:
+                if self._buf is None:
+                    self._buf = io.StringIO()
+                    self._pending_since = time.monotonic()
+                self._buf.write(text)
+                if (self._buf.tell() <= self._max_buffer
+                        and time.monotonic() - self._pending_since <= self._flush_interval):
+                    return
+                lines = self._drain()
+
+        # Hand lines to the client outside the lock
+        self._send_lines(lines)
+
+    def writelines(self, lines):
+        """Write a sequence of strings with a single buffered write"""
+        self.write(''.join(lines))
 
     def flush(self):
         """Flush remaining buffered content"""
         sys.__stdout__.flush()
         with self._lock:
-            if self.buffer.strip():
-                self.client.send_log(self.run_id, self.buffer)
-                self.buffer = ""
+            lines = self._drain()
+        self._send_lines(lines)
+
+    def _drain(self) -> List[str]:
+        """Empty the buffer, including a partial line, and return its lines (caller holds the lock)"""
+        if self._buf is None:
+            return []
+        content = self._buf.getvalue()
+        self._reset_buffer("")
+        return content.split('\n')
+
+    def _reset_buffer(self, pending: str):
+        """Replace the buffer with the given pending partial line (None if empty)"""
+        if not pending:
+            self._buf = None
+            return
+        self._buf = io.StringIO()
+        self._buf.write(pending)
+        self._pending_since = time.monotonic()
+
+    def _send_lines(self, lines: List[str]):
+        """Send the non-blank lines as log messages in one client call"""
+        lines = [line for line in lines if line.strip()]
+        if lines:
+            self.client.send_logs(self.run_id, lines)
 
     def start_capture(self):
         """Start capturing logs for the current thread"""
-        _thread_local.log_capture = self
+        global _active_captures
+        with _active_captures_lock:
+            _active_captures += 1
+        self._token = _log_capture_var.set(self)
 
     def stop_capture(self):
-        """Stop capturing logs for the current thread"""
+        """Stop capturing logs for the current thread, restoring any enclosing capture"""
+        global _active_captures
         self.flush()
-        _thread_local.log_capture = None
+        _log_capture_var.reset(self._token)
+        with _active_captures_lock:
+            _active_captures -= 1
+
+
+def _echo(text: str):
+    """Write a line to the real stdout without capturing it as a flow log"""
+    sys.__stdout__.write(text + "\n")
+    sys.__stdout__.flush()
 
 
 # Global thread-aware stdout - installed once
@@ -177,6 +374,11 @@ def _ensure_thread_aware_stdout():
     """Install the thread-aware stdout wrapper if not already installed"""
     global _thread_aware_stdout, _stdout_installed
     if not _stdout_installed:
+        # Let the real stream flush itself at line ends, even when redirected to a file
+        try:
+            sys.__stdout__.reconfigure(line_buffering=True)
+        except (AttributeError, ValueError):
+            pass
         _thread_aware_stdout = ThreadAwareStdout()
         sys.stdout = _thread_aware_stdout
         _stdout_installed = True
@@ -186,6 +388,23 @@ def _ensure_thread_aware_stdout():
 # Workflow Registry (Core Engine)
 # ============================================================================
 
+class _TaskCounter:
+    """Task indices for one run, shared by every thread working on it"""
+
+    __slots__ = ('value', '_lock')
+
+    def __init__(self, start: int = 0):
+        self.value = start
+        self._lock = threading.Lock()
+
+    def take(self) -> int:
+        """Return the next index and advance the counter"""
+        with self._lock:
+            index = self.value
+            self.value += 1
+            return index
+
+
 class WorkflowRegistry:
     """
     Core orchestration engine for Perfect.
@@ -197,7 +416,16 @@ class WorkflowRegistry:
         # Registry storage
         self._flows: Dict[str, FlowDefinition] = {}
         self._tasks: Dict[str, TaskDefinition] = {}
-        self._pending_flows: List[FlowDefinition] = []
+        # Keyed by function name: a flow called repeatedly before connecting is registered once
+        self._pending_flows: Dict[str, FlowDefinition] = {}
+        self._flows_by_name: Dict[str, FlowDefinition] = {}
+
+        # Bumped on every task/flow registration to invalidate cached flow analysis
+        self._version = 0
+        self._analyzed_versions: Dict[str, int] = {}
+        self._source_cache: Dict[Any, str] = {}
+        self._called_names_cache: Dict[Any, Tuple[str, ...]] = {}
+        self._task_call_pattern: Optional[re.Pattern] = None
 
         # Client connection
         self._client = None
@@ -208,11 +436,27 @@ class WorkflowRegistry:
         # Auto-connection and listening
         self._auto_connect_enabled = True
         self._listener_started = False
+        self._listener_lock = threading.Lock()
+        # Set on shutdown: stops the listener and heartbeats and wakes interruptible sleeps.
+        # Replaced by a fresh event when the next session starts (see _session_stop_event)
+        self._stop_event = threading.Event()
+        self._listener_thread: Optional[threading.Thread] = None
         self._listening = False
 
         # Execution context (thread-local for parallel flow support)
         self._execution_context = threading.local()
 
+        # RUNNING keep-alive cadence while a task executes (seconds)
+        self._progress_interval = 0.2
+
+        # Tasks estimated below this (ms) skip keep-alives and only post start/completion
+        self._keepalive_min_ms = 500
+
+        # Running tasks awaiting keep-alives, sent together by a single dispatcher thread
+        self._heartbeats: Dict[Tuple[str, int], TaskDefinition] = {}
+        self._heartbeat_lock = threading.Lock()
+        self._heartbeat_thread: Optional[threading.Thread] = None
+
     # ------------------------------------------------------------------------
     # Thread-local execution context helpers
     # ------------------------------------------------------------------------
@@ -227,11 +471,25 @@ class WorkflowRegistry:
 
     @property
     def _current_task_index(self) -> int:
-        return getattr(self._execution_context, 'task_index', 0)
+        counter = getattr(self._execution_context, 'task_counter', None)
+        return counter.value if counter else 0
 
     @_current_task_index.setter
     def _current_task_index(self, value: int):
-        self._execution_context.task_index = value
+        # A fresh counter per run; run_parallel() shares it with its worker threads
+        self._execution_context.task_counter = _TaskCounter(value)
+
+    def _next_task_index(self) -> int:
+        """Claim the next task index of the current run"""
+        # run_parallel() reserves each call's first index in argument order
+        reserved = getattr(self._execution_context, 'reserved_index', None)
+        if reserved is not None:
+            self._execution_context.reserved_index = None
+            return reserved
+        counter = getattr(self._execution_context, 'task_counter', None)
+        if counter is None:
+            counter = self._execution_context.task_counter = _TaskCounter()
+        return counter.take()
 
     # ------------------------------------------------------------------------
     # Configuration
@@ -258,7 +516,6 @@ class WorkflowRegistry:
             return
 
         print("\n[Perfect SDK] Auto-connecting to backend...")
-        from perfect.api import create_client, PerfectAPIClient
 
         if self._mock:
             self._client = create_client(mock=True)
@@ -273,8 +530,15 @@ class WorkflowRegistry:
             return
 
         print(f"[Perfect SDK] Registering {len(self._pending_flows)} flows...")
-        for flow_def in self._pending_flows:
-            self._register_flow_with_backend(flow_def)
+        try:
+            payloads = [
+                self._analyze_flow(flow_name).to_api_dict()
+                for flow_name in self._pending_flows
+            ]
+            # One round-trip for every flow (auto_trigger=False to prevent server execution requests)
+            self._client.register_flows(payloads, auto_trigger=False)
+        except Exception as e:
+            print(f"[Perfect SDK] Warning: Failed to register flows: {e}")
         self._pending_flows.clear()
         print(f"[Perfect SDK] All flows registered\n")
 
@@ -288,7 +552,7 @@ class WorkflowRegistry:
             analyzed_flow = self._analyze_flow(flow_def.func.__name__)
 
             # Convert to API format
-            payload = self._flow_to_dict(analyzed_flow)
+            payload = analyzed_flow.to_api_dict()
 
             # Register with backend (auto_trigger=False to prevent server execution requests)
             # Returns the flow object including 'id'
@@ -309,59 +573,73 @@ class WorkflowRegistry:
     # Auto Listener (Background Thread)
     # ------------------------------------------------------------------------
 
+    def _session_stop_event(self) -> threading.Event:
+        """
+        Stop event of the current session, replaced with a fresh one once set.
+
+        shutdown() and the end of listening set the event for good, so the tasks
+        holding it stop; the next listener or flow call then starts a new
+        session instead of inheriting the stop.
+        """
+        with self._listener_lock:
+            if self._stop_event.is_set():
+                self._stop_event = threading.Event()
+            return self._stop_event
+
     def _auto_start_listener(self):
         """Start background listener after first flow registration"""
-        if self._listener_started or not self._client:
-            return
-
-        self._listener_started = True
+        if self._listener_started:
+            return  # Checked again under the lock; skips it on every later flow call
+        with self._listener_lock:
+            if self._listener_started or not self._client:
+                return
+            self._listener_started = True
+        stop_event = self._session_stop_event()
 
         def run_listener():
             """Background listener thread"""
-            from perfect.executor import create_execution_handler
-
-            if not self._client:
-                return
-
-            print("\n" + "=" * 60)
-            print("Perfect - Auto-Listening for Execution Requests")
-            print("=" * 60 + "\n")
-
-            # Track flow completion
-            total_flows = len(self._flows)
-            completed_count = {'value': 0}
-            lock = threading.Lock()
-
-            def on_flow_complete(flow_name: str):
-                with lock:
-                    completed_count['value'] += 1
-                    print(f"\n[Perfect] Completed {completed_count['value']}/{total_flows} flows")
-
-                    if completed_count['value'] >= total_flows:
-                        print("[Perfect] All flows completed. Shutting down...")
-                        self._client.stop_listening()
-
             try:
-                handler = create_execution_handler(self._client, on_flow_complete)
-                self._client.on_execution_request(handler)
+                if stop_event.is_set() or not self._client:
+                    return
+
                 self._listening = True
-                self._client.listen_for_executions()
-            except KeyboardInterrupt:
-                print("\n[Perfect] Shutting down...")
+                _run_listener(
+                    self._client,
+                    self.num_flows,
+                    "Perfect - Auto-Listening for Execution Requests",
+                    "[Perfect]",
+                    stop_event
+                )
             finally:
-                if self._client:
-                    self._client.close()
-
-        # Cleanup on exit
-        def cleanup():
+                # Let the next flow call start a new listener
+                self._listening = False
+                _listening_registries.discard(self)
+                with self._listener_lock:
+                    self._listener_started = False
+
+        # Daemon thread so it never blocks interpreter exit; the module-level
+        # atexit hook calls _stop_listener to shut it down gracefully instead
+        self._listener_thread = threading.Thread(
+            target=run_listener,
+            name='perfect-listener',
+            daemon=True
+        )
+        # Added before starting so a listener that ends at once can't leave a stale entry
+        _listening_registries.add(self)
+        self._listener_thread.start()
+
+    def _stop_listener(self, timeout: float = 2.0):
+        """Stop the background listener and wait briefly for it to close the client"""
+        self._stop_event.set()
+        thread = self._listener_thread
+        if thread is None:
+            return
+        # Repeat the stop: one sent before the listener starts polling is lost
+        deadline = time.monotonic() + timeout
+        while thread.is_alive() and time.monotonic() < deadline:
             if self._client and self._listening:
-                self._client.close()
-
-        atexit.register(cleanup)
-
-        # Start listener thread
-        listener_thread = threading.Thread(target=run_listener, daemon=False)
-        listener_thread.start()
+                self._client.stop_listening()
+            thread.join(0.05)
 
     # ------------------------------------------------------------------------
     # Decorators
@@ -388,7 +666,7 @@ class WorkflowRegistry:
         """
         def decorator(func: Callable) -> Callable:
             # Extract description from docstring
-            description = (func.__doc__ or "").strip().split('\n')[0]
+            description = func.__doc__.strip().partition('\n')[0] if func.__doc__ else ""
 
             # Use provided name or fall back to function name
             task_name = name or func.__name__
@@ -403,6 +681,10 @@ class WorkflowRegistry:
             )
 
             self._tasks[func.__name__] = task_def
+            self._task_call_pattern = None
+            self._version += 1
+
+            executing_msg = f"[Task] Executing {task_name}..."
 
             @functools.wraps(func)
             def wrapper(*args, **kwargs):
@@ -411,66 +693,178 @@ class WorkflowRegistry:
                     return self._execute_tracked_task(task_def, func, args, kwargs)
                 else:
                     # Direct execution without tracking
-                    print(f"[Task] Executing {task_name}...")
+                    if VERBOSE:
+                        print(executing_msg)
                     return func(*args, **kwargs)
 
             return wrapper
         return decorator
 
-    def _execute_tracked_task(self, task_def: TaskDefinition, func: Callable, args: tuple, kwargs: dict) -> Any:
-        """Execute a task with server tracking"""
-        import time as time_module
-        import threading
+    def _add_heartbeat(self, run_id: str, task_index: int, task_def: TaskDefinition):
+        """Register a running task for keep-alives, starting the dispatcher if idle"""
+        with self._heartbeat_lock:
+            self._heartbeats[(run_id, task_index)] = task_def
+            if self._heartbeat_thread is None:
+                self._heartbeat_thread = threading.Thread(
+                    target=self._heartbeat_loop,
+                    name='perfect-heartbeat',
+                    daemon=True
+                )
+                self._heartbeat_thread.start()
+
+    def _remove_heartbeat(self, run_id: str, task_index: int):
+        """Stop sending keep-alives for a finished task"""
+        with self._heartbeat_lock:
+            self._heartbeats.pop((run_id, task_index), None)
+
+    def _heartbeat_loop(self):
+        """
+        Send one batched RUNNING update per interval for every running task.
 
-        run_id = self._current_run_id
-        task_index = self._current_task_index
-        self._current_task_index += 1
+        The server calculates actual progress from its estimatedTime, so these
+        are keep-alives only. The thread exits once no tasks are running (or
+        shutdown is requested) and is restarted by the next _add_heartbeat().
+        """
+        while True:
+            stop_event = self._stop_event
+            stopping = stop_event.wait(self._progress_interval)
+            with self._heartbeat_lock:
+                tasks = list(self._heartbeats)
+                # An event replaced by a new session no longer stops its tasks
+                if (stopping and stop_event is self._stop_event) or not tasks:
+                    self._heartbeat_thread = None
+                    return
+            try:
+                self._client.update_tasks_batch(tasks)
+            except Exception as e:
+                print(f"[Perfect SDK] Warning: Failed to send task keep-alives: {e}")
 
-        print(f"[Task] Executing {task_def.name} (task {task_index})...")
+    def interruptible_sleep(self, seconds: float):
+        """
+        Sleep inside a task, waking early if the SDK is shutting down.
 
-        # Mark task as running (include task name, estimated time, and crucial_pass for dynamic task creation)
-        self._client.update_task_state(run_id, task_index, 'RUNNING', 0, task_name=task_def.name, estimated_time=task_def.estimated_time, crucial_pass=task_def.crucial_pass)
+        Use in place of time.sleep() in task bodies so stopping the SDK (the end
+        of listen(), including Ctrl+C there, or an explicit shutdown()) does not
+        wait out every running task's full duration.
 
-        task_start = time_module.time()
-        estimated_ms = task_def.estimated_time
-        task_result = None
-        task_error = None
+        Args:
+            seconds: Time to sleep
 
-        # Get the current log capture from the flow thread (if any)
-        parent_log_capture = getattr(_thread_local, 'log_capture', None)
+        Raises:
+            RuntimeError: If shutdown was requested before or during the sleep
+        """
+        stop_event = getattr(self._execution_context, 'stop_event', None) or self._stop_event
+        if stop_event.wait(seconds):
+            raise RuntimeError("Perfect SDK is shutting down")
+
+    def run_parallel(self, *calls: Callable[[], Any], max_workers: int = None) -> List[Any]:
+        """
+        Run independent tasks concurrently inside a flow.
+
+        Each call runs on a worker thread that shares the flow's run, so its
+        tasks are tracked exactly like sequential ones. Task indices are
+        reserved in argument order before any call starts, matching the order
+        the flow registered its tasks in; each call is expected to run one task
+        (further tasks in a call take the next free index). Each worker captures
+        its output separately, so lines from different tasks never interleave.
+        Waits for every call, then returns their results in argument order; if
+        any call raised, the first such exception (in argument order) is re-raised.
+
+        Args:
+            *calls: Zero-argument callables, e.g. tasks or lambdas wrapping them
+            max_workers: Thread cap (default: one per call)
+
+        Returns:
+            List of the calls' return values
+
+        Example:
+            @flow(name="Health Check")
+            def health_check():
+                latency, pool = run_parallel(check_api_latency, check_db_pool)
+        """
+        if not calls:
+            return []
 
-        # Execute task in background thread for progress updates
-        def execute_task():
-            nonlocal task_result, task_error
-            # Inherit the log capture from the parent flow thread
-            if parent_log_capture is not None:
-                _thread_local.log_capture = parent_log_capture
+        run_id = self._current_run_id
+        counter = getattr(self._execution_context, 'task_counter', None)
+        stop_event = getattr(self._execution_context, 'stop_event', None)
+        parent_capture = _log_capture_var.get()
+
+        # Reserve indices up front: workers start in arbitrary order, and the
+        # server matches task updates to the registered tasks by index
+        if run_id and counter is not None:
+            indices = [counter.take() for _ in calls]
+        else:
+            indices = [None] * len(calls)
+
+        def run_call(call: Callable[[], Any], index: Optional[int]) -> Any:
+            self._current_run_id = run_id
+            self._execution_context.task_counter = counter
+            self._execution_context.reserved_index = index
+            self._execution_context.stop_event = stop_event
+            log_capture = None
+            if parent_capture is not None:
+                # A capture per worker keeps partial lines of concurrent tasks apart
+                log_capture = LogCapture(parent_capture.client, parent_capture.run_id)
+                log_capture.start_capture()
             try:
-                task_result = func(*args, **kwargs)
-            except Exception as e:
-                task_error = e
+                return call()
             finally:
-                # Clear the log capture for this thread
-                _thread_local.log_capture = None
+                if log_capture is not None:
+                    log_capture.stop_capture()
+                # Pool threads are reused; don't leak this run's context
+                self._current_run_id = None
+                self._execution_context.task_counter = None
+                self._execution_context.reserved_index = None
+                self._execution_context.stop_event = None
+
+        with concurrent.futures.ThreadPoolExecutor(
+            max_workers=max_workers or len(calls),
+            thread_name_prefix='perfect-task'
+        ) as pool:
+            # One context copy per call, so each worker's capture stays its own
+            futures = [
+                pool.submit(contextvars.copy_context().run, run_call, call, index)
+                for call, index in zip(calls, indices)
+            ]
+        return [future.result() for future in futures]
 
-        task_thread = threading.Thread(target=execute_task, daemon=True)
-        task_thread.start()
+    def _execute_tracked_task(self, task_def: TaskDefinition, func: Callable, args: tuple, kwargs: dict) -> Any:
+        """Execute a task with server tracking"""
+        run_id = self._current_run_id
+        task_index = self._next_task_index()
 
-        # Update progress while task is running
-        # Send updates every 100ms to let the server calculate progress using its statistics
-        last_update_time = time_module.time()
-        while task_thread.is_alive():
-            time_module.sleep(0.01)  # 10ms sleep interval
-            now = time_module.time()
-            # Send update every 100ms (server calculates actual progress from its estimatedTime)
-            if now - last_update_time >= 0.1:
-                self._client.update_task_state(run_id, task_index, 'RUNNING')
-                last_update_time = now
+        # Mark task as running (include task name, estimated time, and crucial_pass for dynamic task creation)
+        start_msg = f"[Task] Executing {task_def.name} (task {task_index})..."
+        _echo(start_msg)
+        self._client.post_task_event(
+            run_id, task_index,
+            state='RUNNING', progress=0, log=start_msg,
+            task_name=task_def.name, estimated_time=task_def.estimated_time, crucial_pass=task_def.crucial_pass
+        )
 
-        task_thread.join()
+        # Integer monotonic clock: immune to wall-clock adjustments
+        task_start_ns = time.monotonic_ns()
+        task_result = None
+        task_error = None
+
+        # The heartbeat dispatcher keeps the task RUNNING while the body runs inline
+        # in this thread (so thread-local log capture and run context still apply).
+        # Short tasks (estimated under _keepalive_min_ms) are not registered and only
+        # post their start and completion events.
+        tracked = task_def.estimated_time >= self._keepalive_min_ms
+        if tracked:
+            self._add_heartbeat(run_id, task_index, task_def)
+        try:
+            task_result = func(*args, **kwargs)
+        except Exception as e:
+            task_error = e
+        finally:
+            if tracked:
+                self._remove_heartbeat(run_id, task_index)
 
         # Calculate actual duration
-        actual_duration = int((time_module.time() - task_start) * 1000)
+        actual_duration = (time.monotonic_ns() - task_start_ns) // 1_000_000
 
         if task_error:
             # Task failed
@@ -479,47 +873,45 @@ class WorkflowRegistry:
                 'note': str(task_error),
                 'table': []
             }
-            self._client.update_task_state(
-                run_id, task_index, 'FAILED', 0,
-                duration_ms=actual_duration,
-                result=error_result
+            fail_msg = f"[Task] {task_def.name} failed: {task_error}"
+            _echo(fail_msg)
+            self._client.post_task_event(
+                run_id, task_index,
+                state='FAILED', progress=0, duration_ms=actual_duration,
+                result=error_result, log=fail_msg
             )
-            print(f"[Task] {task_def.name} failed: {task_error}")
 
             if task_def.crucial_pass:
                 raise task_error
             return None
 
-        # Check if task returned a result with passed=False
+        # Only TaskResult carries a reportable result; anything else is opaque
         result_dict = None
-        if task_result and hasattr(task_result, 'to_dict'):
+        if isinstance(task_result, TaskResult):
             result_dict = task_result.to_dict()
 
-        # Check if task explicitly failed via passed=False
-        task_passed = True
-        if task_result and hasattr(task_result, 'passed'):
-            task_passed = task_result.passed
-
-        if not task_passed:
-            # Task returned passed=False - treat as failure
-            self._client.update_task_state(
-                run_id, task_index, 'FAILED', 0,
-                duration_ms=actual_duration,
-                result=result_dict
-            )
-            print(f"[Task] {task_def.name} failed: {result_dict.get('note', 'Task returned passed=False') if result_dict else 'Task returned passed=False'}")
+            if not task_result.passed:
+                # Task returned passed=False - treat as failure
+                fail_msg = f"[Task] {task_def.name} failed: {task_result.note}"
+                _echo(fail_msg)
+                self._client.post_task_event(
+                    run_id, task_index,
+                    state='FAILED', progress=0, duration_ms=actual_duration,
+                    result=result_dict, log=fail_msg
+                )
 
-            if task_def.crucial_pass:
-                raise Exception(f"Task '{task_def.name}' failed: {result_dict.get('note', 'passed=False') if result_dict else 'passed=False'}")
-            return task_result
+                if task_def.crucial_pass:
+                    raise Exception(f"Task '{task_def.name}' failed: {task_result.note}")
+                return task_result
 
         # Task completed successfully
-        self._client.update_task_state(
-            run_id, task_index, 'COMPLETED', 100,
-            duration_ms=actual_duration,
-            result=result_dict
+        done_msg = f"[Task] {task_def.name} completed in {actual_duration}ms"
+        _echo(done_msg)
+        self._client.post_task_event(
+            run_id, task_index,
+            state='COMPLETED', progress=100, duration_ms=actual_duration,
+            result=result_dict, log=done_msg
         )
-        print(f"[Task] {task_def.name} completed in {actual_duration}ms")
 
         return task_result
 
@@ -529,7 +921,8 @@ class WorkflowRegistry:
         description: str = "",
         auto_trigger: bool = False,
         auto_trigger_config: str = "development",
-        tags: Optional[Dict[str, str]] = None
+        tags: Optional[Dict[str, str]] = None,
+        cache: Optional[FlowCache] = None
     ) -> Callable:
         """
         Decorator to register a function as a flow.
@@ -540,6 +933,8 @@ class WorkflowRegistry:
             auto_trigger: Auto-trigger after registration
             auto_trigger_config: Configuration for auto-trigger
             tags: Metadata tags (e.g., {"version": "v1.0"})
+            cache: Optional FlowCache; repeat calls with the same arguments
+                return the cached result instead of re-running the flow
 
         Example:
             @flow(name="Daily ETL", tags={"version": "v1.0"})
@@ -558,36 +953,57 @@ class WorkflowRegistry:
             )
 
             self._flows[func.__name__] = flow_def
+            self._flows_by_name[name] = flow_def
+            self._version += 1
 
-            @functools.wraps(func)
-            def wrapper(*args, **kwargs):
+            # Read and parse the flow's source now, at import, so the first call
+            # only intersects the cached call names with the registered tasks
+            try:
+                self._called_names(func)
+            except (OSError, TypeError):
+                pass  # Source unavailable (e.g. defined in a REPL); analysis will report it
+
+            # Progress lines are formatted once here rather than on every call
+            start_msg = f"[Flow] Starting {name}..."
+            done_msg = f"[Flow] Completed {name}"
+
+            # Set once the registry has a client, so later calls skip _ensure_client
+            connected = False
+
+            def run_flow(*args, **kwargs):
+                nonlocal connected
                 # Auto-connect to backend
-                self._ensure_client()
+                if not connected:
+                    self._ensure_client()
+                    connected = self._client is not None
 
                 # Register flow for THIS execution and get the flow ID directly
                 # This avoids race conditions when multiple threads run the same flow
                 flow_id = None
                 if self._client:
                     flow_id = self._register_flow_with_backend(flow_def)
+                    # Serve execution requests from the UI in the background from now on
+                    self._auto_start_listener()
                 else:
-                    self._pending_flows.append(flow_def)
+                    self._pending_flows[func.__name__] = flow_def
 
                 # Execute flow with backend tracking for UI visibility
-                print(f"[Flow] Starting {name}...")
+                if VERBOSE:
+                    print(start_msg)
 
                 if self._client and flow_id:
                     # Create a run on the server for UI tracking
                     try:
-                        import requests
-                        # Create run for client-initiated execution
-                        response = requests.post(
+                        # Create run for client-initiated execution (reuses the client's pooled connections)
+                        response = self._client.session.post(
                             f"{self._client.base_url}/api/engine/run/{flow_id}",
                             json={"configuration": "development"},
                             timeout=2
                         )
                         if response.ok:
                             run_id = response.json().get('runId')
-                            print(f"[Flow] Created run: {run_id}")
+                            if VERBOSE:
+                                print(f"[Flow] Created run: {run_id}")
 
                             # Set execution context for task tracking
                             self._current_run_id = run_id
@@ -604,10 +1020,15 @@ class WorkflowRegistry:
                                 # Execute the actual flow function
                                 result = func(*args, **kwargs)
 
+                                # Deliver queued logs before the server finalizes the run
+                                log_capture.flush()
+                                self._client.flush_logs()
+
                                 # Signal flow completion with actual task count
                                 actual_task_count = self._current_task_index
                                 self._client.complete_flow(run_id, actual_task_count)
-                                print(f"[Flow] Completed {name} with {actual_task_count} tasks")
+                                if VERBOSE:
+                                    print(f"{done_msg} with {actual_task_count} tasks")
                                 # Return both the flow result and run_id as a tuple
                                 return (result, run_id)
                             except Exception as e:
@@ -635,9 +1056,38 @@ class WorkflowRegistry:
                         print(f"[Flow] Warning: Flow registration failed, executing without tracking")
                     result = func(*args, **kwargs)
 
-                print(f"[Flow] Completed {name}")
+                if VERBOSE:
+                    print(done_msg)
                 return result
 
+            @functools.wraps(func)
+            def wrapper(*args, **kwargs):
+                # Bind the run to the current session: a call after shutdown() starts
+                # a new one, while runs from the stopped session stay stopped
+                previous = getattr(self._execution_context, 'stop_event', None)
+                self._execution_context.stop_event = self._session_stop_event()
+                try:
+                    return run_flow(*args, **kwargs)
+                finally:
+                    self._execution_context.stop_event = previous
+
+            if cache is not None:
+                uncached = wrapper
+
+                @functools.wraps(func)
+                def wrapper(*args, **kwargs):
+                    key = cache.key(args, kwargs)
+                    if key is not None:
+                        cached = cache.get(key)
+                        if cached is not _CACHE_MISS:
+                            if VERBOSE:
+                                print(f"[Flow] {name}: returning cached result")
+                            return cached
+                    result = uncached(*args, **kwargs)
+                    if key is not None:
+                        cache.put(key, result)
+                    return result
+
             return wrapper
         return decorator
 
@@ -652,39 +1102,88 @@ class WorkflowRegistry:
 
         flow_def = self._flows[flow_name]
 
-        # Static analysis: find task calls in source code
-        import inspect
-        source = inspect.getsource(flow_def.func)
+        # Source analysis only changes when tasks or flows are (re)registered
+        if self._analyzed_versions.get(flow_name) == self._version:
+            return flow_def
 
-        tasks_in_flow = []
-        for task_name, task_def in self._tasks.items():
-            if f"{task_name}(" in source:
-                tasks_in_flow.append(task_def)
+        # Static analysis: find task calls in source code
+        # Tasks are listed in the order the flow first calls them
+        called = self._called_names(flow_def.func)
+        tasks_in_flow = [self._tasks[name] for name in called if name in self._tasks]
 
         flow_def.tasks = tasks_in_flow
+        flow_def._api_dict = None
+        self._analyzed_versions[flow_name] = self._version
         return flow_def
 
+    def _get_source(self, func: Callable) -> str:
+        """Source of a function, read from disk once per code object"""
+        code = func.__code__
+        source = self._source_cache.get(code)
+        if source is None:
+            source = inspect.getsource(func)
+            self._source_cache[code] = source
+        return source
+
+    def _called_names(self, func: Callable) -> Tuple[str, ...]:
+        """
+        Names of everything a function calls, parsed once per code object.
+
+        Collects `name(...)` and `obj.name(...)` calls from the function's AST,
+        so a task named `load` is not matched by a call to `load_all(...)`, plus
+        the names of tasks handed to run_parallel().
+        Names are returned once each, ordered by their first call in the source.
+        Source that does not parse on its own (e.g. a lambda taken from the
+        middle of an expression) falls back to matching registered task names.
+        """
+        code = func.__code__
+        called = self._called_names_cache.get(code)
+        if called is None:
+            source = self._get_source(func)
+            try:
+                tree = ast.parse(textwrap.dedent(source))
+            except SyntaxError:
+                # Not cached: the result depends on which tasks are registered
+                return self._match_task_calls(source)
+            # ast.walk is breadth-first, so sort calls by where they end in the
+            # source: an argument call like `b` in `a(b())` runs, and ends, first
+            calls = []
+            for node in ast.walk(tree):
+                if isinstance(node, ast.Call):
+                    if isinstance(node.func, ast.Name):
+                        callee = node.func.id
+                    elif isinstance(node.func, ast.Attribute):
+                        callee = node.func.attr
+                    else:
+                        continue
+                    calls.append((node.end_lineno, node.end_col_offset, callee))
+                    # Tasks handed to run_parallel(load, check) run too; names passed
+                    # to any other call (e.g. print(data)) are just values
+                    if callee == 'run_parallel':
+                        for arg in node.args:
+                            if isinstance(arg, ast.Name):
+                                calls.append((arg.end_lineno, arg.end_col_offset, arg.id))
+            calls.sort()
+            called = tuple(dict.fromkeys(name for _, _, name in calls))
+            self._called_names_cache[code] = called
+        return called
+
+    def _match_task_calls(self, source: str) -> Tuple[str, ...]:
+        """Find calls to registered tasks in source text with one compiled pattern"""
+        if not self._tasks:
+            return ()
+        if self._task_call_pattern is None:
+            # Longest names first so alternation prefers `load_all` over `load`
+            names = sorted(self._tasks, key=len, reverse=True)
+            self._task_call_pattern = re.compile(
+                r'\b(' + '|'.join(map(re.escape, names)) + r')\s*\('
+            )
+        return tuple(dict.fromkeys(self._task_call_pattern.findall(source)))
+
     def analyze_flow(self, flow_name: str) -> FlowDefinition:
         """Analyze flow to determine which tasks it uses (public API)"""
         return self._analyze_flow(flow_name)
 
-    def _flow_to_dict(self, flow_def: FlowDefinition) -> Dict[str, Any]:
-        """Convert flow definition to API format"""
-        return {
-            "name": flow_def.name,
-            "description": flow_def.description,
-            "tags": flow_def.tags,
-            "tasks": [
-                {
-                    "name": task.name,
-                    "description": task.description,
-                    "estimatedTime": task.estimated_time,
-                    "crucialPass": task.crucial_pass
-                }
-                for task in flow_def.tasks
-            ]
-        }
-
     # ------------------------------------------------------------------------
     # Accessors
     # ------------------------------------------------------------------------
@@ -693,10 +1192,27 @@ class WorkflowRegistry:
         """Get all registered flows"""
         return list(self._flows.values())
 
+    def iter_flows(self) -> Iterable[FlowDefinition]:
+        """Iterate registered flows without copying them into a list"""
+        return self._flows.values()
+
+    @property
+    def num_flows(self) -> int:
+        """Number of registered flows"""
+        return len(self._flows)
+
+    def get_flow_by_name(self, name: str) -> Optional[FlowDefinition]:
+        """Get a registered flow by its display name"""
+        return self._flows_by_name.get(name)
+
     def get_tasks(self) -> List[TaskDefinition]:
         """Get all registered tasks"""
         return list(self._tasks.values())
 
+    def iter_tasks(self) -> Iterable[TaskDefinition]:
+        """Iterate registered tasks without copying them into a list"""
+        return self._tasks.values()
+
     def get_report(self, run_id: str) -> Optional[Dict[str, Any]]:
         """
         Get report for a specific run ID.
@@ -725,39 +1241,49 @@ class WorkflowRegistry:
         Returns:
             Local file path if successful, None otherwise
         """
-        import os
-        import requests
-
         # Get report metadata
         report = self.get_report(run_id)
         if not report:
             print(f"[Perfect SDK] No report available for run: {run_id}")
             return None
 
-        # Download the report HTML file
+        # Create local directory structure matching server (Reports/FlowName/)
+        local_path = Path(output_dir, *report['path'].split('/')[1:])
+        local_path.parent.mkdir(parents=True, exist_ok=True)
+
+        # Stream the report HTML file straight to disk in 64KB chunks
         report_url = f"{self._backend_url}{report['url']}"
         try:
-            response = requests.get(report_url, timeout=10)
-            response.raise_for_status()
+            with self._client.session.get(report_url, timeout=10, stream=True) as response:
+                response.raise_for_status()
+                with open(local_path, 'wb') as f:
+                    for chunk in response.iter_content(chunk_size=64 * 1024):
+                        f.write(chunk)
         except requests.exceptions.RequestException as e:
             print(f"[Perfect SDK] Failed to download report: {e}")
             return None
-
-        # Create local directory structure matching server (Reports/FlowName/)
-        local_dir = os.path.join(output_dir, report['path'].split('/')[1])
-        os.makedirs(local_dir, exist_ok=True)
-
-        # Save the report locally
-        local_path = os.path.join(output_dir, *report['path'].split('/')[1:])
-        try:
-            with open(local_path, 'w', encoding='utf-8') as f:
-                f.write(response.text)
-            print(f"[Perfect SDK] Report saved: {local_path} ({report['size'] / 1024:.2f} KB)")
-            return local_path
         except IOError as e:
             print(f"[Perfect SDK] Failed to save report: {e}")
             return None
 
+        print(f"[Perfect SDK] Report saved: {local_path} ({local_path.stat().st_size / 1024:.2f} KB)")
+        return str(local_path)
+
+
+# Registries with a running auto-listener. Weak, so the single atexit hook
+# never keeps a registry (or its client) alive.
+_listening_registries: "weakref.WeakSet[WorkflowRegistry]" = weakref.WeakSet()
+
+
+@atexit.register
+def _stop_listeners():
+    """Stop every running auto-listener at interpreter exit"""
+    for registry in list(_listening_registries):
+        try:
+            registry._stop_listener()
+        except Exception:
+            pass
+
 
 # ============================================================================
 # Global Registry and Exports
@@ -769,6 +1295,8 @@ _default_registry = WorkflowRegistry()
 # Export decorators from default instance
 task = _default_registry.task
 flow = _default_registry.flow
+run_parallel = _default_registry.run_parallel
+interruptible_sleep = _default_registry.interruptible_sleep
 
 
 def get_registry() -> WorkflowRegistry:
@@ -847,54 +1375,124 @@ def download_report(run_id: str, output_dir: str = "Reports") -> Optional[str]:
     return _default_registry.download_report(run_id, output_dir)
 
 
+def _run_listener(client, total_flows: int, title: str, prefix: str, stop_event: threading.Event = None):
+    """
+    Listen for execution requests until every flow has completed once.
+
+    Shared by listen() and the registry's background auto-listener. Blocks
+    until all flows complete or the listener is stopped, then closes the client.
+
+    Args:
+        client: Connected PerfectAPIClient
+        total_flows: Number of flow completions after which to stop listening
+        title: Banner printed when listening starts
+        prefix: Tag for status messages (e.g. "[Perfect]")
+        stop_event: Registry stop event, set when listening ends (all flows
+            done, stop requested or Ctrl+C) so running tasks'
+            interruptible_sleep() calls return immediately
+    """
+    from perfect.executor import create_execution_handler
+
+    print("\n" + "=" * 60)
+    print(title)
+    print("=" * 60 + "\n")
+
+    # Track flow completion
+    completion_counter = itertools.count(1)  # next() is atomic, no lock needed
+
+    def on_flow_complete(flow_name: str):
+        completed = next(completion_counter)
+        print(f"\n{prefix} Completed {completed}/{total_flows} flows")
+
+        if completed >= total_flows:
+            print(f"{prefix} All flows completed. Shutting down...")
+            client.stop_listening()
+
+    handler = None
+    try:
+        handler = create_execution_handler(client, on_flow_complete)
+        client.on_execution_request(handler)
+        client.listen_for_executions()
+    except KeyboardInterrupt:
+        print(f"\n{prefix} Shutting down...")
+    finally:
+        # listen_for_executions() handles Ctrl+C itself and returns normally,
+        # so signal shutdown here whichever way listening ended
+        if stop_event is not None:
+            stop_event.set()
+        # Drop queued runs and don't block here; running flows wind down via the
+        # stop event (interpreter exit still waits for their pool threads)
+        if handler is not None:
+            handler.shutdown(wait=False, cancel_futures=True)
+        client.close()
+
+
 def listen():
     """
     Manually start listening for execution requests (optional).
 
-    This is automatically called when you call a flow, so you typically
-    don't need to call this unless you want explicit control.
+    Calling a flow already starts a background listener, so you typically
+    don't need this unless you want explicit control. If that listener is
+    running, this blocks until it stops instead of polling a second time.
 
     Example:
         my_flow()  # Registers and auto-starts listener
         listen()   # Optional: blocks until interrupted
     """
-    from perfect.executor import create_execution_handler
+    registry = _default_registry
 
     # Ensure client is initialized
-    _default_registry._ensure_client()
+    registry._ensure_client()
 
-    if not _default_registry._client:
+    if not registry._client:
         print("[Perfect SDK] Error: Could not connect to backend")
         return
 
-    client = _default_registry._client
+    # Claim the listener so a flow called meanwhile doesn't start another one
+    with registry._listener_lock:
+        background = registry._listener_thread if registry._listener_started else None
+        registry._listener_started = True
 
-    print("\n" + "=" * 60)
-    print("Perfect Python Client - Listening for Execution Requests")
-    print("=" * 60)
+    if background is not None:
+        try:
+            # Timed joins: an untimed join can't be interrupted by Ctrl+C on Windows
+            while background.is_alive():
+                background.join(0.5)
+        except KeyboardInterrupt:
+            print("\n[Perfect Client] Shutting down...")
+            registry._stop_listener()
+        return
+
+    try:
+        _run_listener(
+            registry._client,
+            registry.num_flows,
+            "Perfect Python Client - Listening for Execution Requests",
+            "[Perfect Client]",
+            registry._session_stop_event()
+        )
+    finally:
+        with registry._listener_lock:
+            registry._listener_started = False
 
-    # Track completion
-    total_flows = len(_default_registry.get_flows())
-    completed_count = {'value': 0}
-    lock = threading.Lock()
 
-    def on_flow_complete(flow_name: str):
-        with lock:
-            completed_count['value'] += 1
-            print(f"\n[Perfect Client] Completed {completed_count['value']}/{total_flows} flows")
+def shutdown():
+    """
+    Stop the SDK: stop the background listener and wake every task blocked in
+    interruptible_sleep().
 
-            if completed_count['value'] >= total_flows:
-                print("[Perfect Client] All flows completed. Shutting down...")
-                client.stop_listening()
+    Call this from your own Ctrl+C handler. Flow threads are not daemons, so the
+    interpreter waits for them before it runs atexit hooks; without this call,
+    running tasks sleep out their full duration before the process can exit.
 
-    try:
-        handler = create_execution_handler(client, on_flow_complete)
-        client.on_execution_request(handler)
-        client.listen_for_executions()
-    except KeyboardInterrupt:
-        print("\n\n[Perfect Client] Shutting down...")
-    finally:
-        client.close()
+    Example:
+        try:
+            while True:
+                time.sleep(1)
+        except KeyboardInterrupt:
+            shutdown()
+    """
+    _default_registry._stop_listener()
 
 
 def connect(
@@ -0,0 +1,43 @@
+"""Tests for the API client's log queue"""
+
+import threading
+
+from perfect.api import PerfectAPIClient
+
+
+class RecordingClient(PerfectAPIClient):
+    """Client that records requests instead of sending them"""
+
+    def __init__(self):
+        super().__init__(base_url="http://localhost:0")
+        self.sent = []
+        self.release = threading.Event()
+
+    def _post_json(self, url, payload):
+        # Hold the flusher on its first request until the test releases it
+        self.release.wait(5)
+        self.sent.append((url.split("/api/", 1)[1], payload))
+        return _Ok()
+
+
+class _Ok:
+    def raise_for_status(self):
+        pass
+
+
+def test_task_event_waits_for_queued_logs_without_blocking_caller():
+    client = RecordingClient()
+    client.send_log("run", "before")
+
+    # Returns while the flusher is still stuck delivering "before"
+    assert client.post_task_event("run", 0, state="COMPLETED", log="done")
+    assert client.sent == []
+
+    client.release.set()
+    client.flush_logs()
+    client.close()
+
+    assert client.sent == [
+        ("flows/run/logs/bulk", {"logs": ["before"]}),
+        ("runs/run/tasks/0/event", {"state": "COMPLETED", "log": "done"}),
+    ]
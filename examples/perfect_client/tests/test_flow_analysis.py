@@ -0,0 +1,42 @@
+"""Tests for static analysis of the tasks a flow calls"""
+
+from perfect.sdk import WorkflowRegistry
+
+
+def test_run_parallel_arguments_count_as_task_calls():
+    registry = WorkflowRegistry()
+
+    @registry.task()
+    def check_api():
+        pass
+
+    @registry.task()
+    def check_db():
+        pass
+
+    @registry.flow(name="Health")
+    def health():
+        registry.run_parallel(check_api, check_db)
+
+    tasks = registry.analyze_flow("health").tasks
+    assert [t.name for t in tasks] == ["check_api", "check_db"]
+
+
+def test_task_passed_as_ordinary_argument_is_not_a_call():
+    registry = WorkflowRegistry()
+
+    @registry.task()
+    def extract():
+        pass
+
+    @registry.task()
+    def transform(data):
+        pass
+
+    @registry.flow(name="Handoff")
+    def handoff():
+        print(extract)
+        transform(extract)
+
+    tasks = registry.analyze_flow("handoff").tasks
+    assert [t.name for t in tasks] == ["transform"]
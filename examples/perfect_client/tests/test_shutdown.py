@@ -0,0 +1,89 @@
+"""Tests for stopping the SDK and using it again afterwards"""
+
+import threading
+
+import pytest
+
+import perfect.sdk as sdk
+from perfect.sdk import WorkflowRegistry
+
+
+class ReturningClient:
+    """Client whose listen_for_executions() returns at once, as after Ctrl+C"""
+
+    def __init__(self, registry):
+        self.registry = registry
+        self.stopped_while_listening = []
+
+    def on_execution_request(self, callback):
+        pass
+
+    def listen_for_executions(self):
+        self.stopped_while_listening.append(self.registry._stop_event.is_set())
+
+    def stop_listening(self):
+        pass
+
+    def close(self):
+        pass
+
+
+class BlockingClient(ReturningClient):
+    """Client that listens until stop_listening() is called"""
+
+    def __init__(self, registry):
+        super().__init__(registry)
+        self.stopped = threading.Event()
+
+    def listen_for_executions(self):
+        self.stopped.wait(5)
+
+    def stop_listening(self):
+        self.stopped.set()
+
+
+def test_exit_hook_stops_auto_listener():
+    registry = WorkflowRegistry()
+    registry._client = BlockingClient(registry)
+
+    registry._auto_start_listener()
+    assert registry in sdk._listening_registries
+
+    sdk._stop_listeners()
+
+    assert not registry._listener_thread.is_alive()
+    assert registry not in sdk._listening_registries
+
+
+def test_flow_runs_after_shutdown():
+    registry = WorkflowRegistry()
+    registry._auto_connect_enabled = False
+
+    @registry.task()
+    def wait():
+        registry.interruptible_sleep(0.01)
+        return "done"
+
+    @registry.flow(name="Wait")
+    def wait_flow():
+        return wait()
+
+    registry._stop_listener()
+    with pytest.raises(RuntimeError):
+        registry.interruptible_sleep(0.01)
+
+    assert wait_flow() == "done"
+    assert not registry._stop_event.is_set()
+
+
+def test_listen_twice(monkeypatch):
+    registry = WorkflowRegistry()
+    client = ReturningClient(registry)
+    registry._client = client
+    monkeypatch.setattr(sdk, "_default_registry", registry)
+
+    sdk.listen()
+    assert registry._stop_event.is_set()
+    sdk.listen()
+
+    assert client.stopped_while_listening == [False, False]
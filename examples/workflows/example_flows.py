@@ -22,7 +22,7 @@ import time
 # Add parent directory to path to import modules
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from perfect.sdk import task, flow, TaskResult
+from perfect.sdk import task, flow, run_parallel, interruptible_sleep, TaskResult
 
 
 # ==========================================
@@ -33,7 +33,7 @@ from perfect.sdk import task, flow, TaskResult
 def fetch_db_connection():
     """Connect to postgres_prod"""
     print("Connecting to database...")
-    time.sleep(3)
+    interruptible_sleep(3)
     return TaskResult(
         passed=True,
         note="Successfully connected to postgres_prod",
@@ -45,7 +45,7 @@ def fetch_db_connection():
 def extract_sales_data(conn=None):
     """Query raw logs"""
     print("Extracting sales data...")
-    time.sleep(8)
+    interruptible_sleep(8)
     return TaskResult(
         passed=True,
         note="Extracted 1000 rows from sales_raw table",
@@ -61,7 +61,7 @@ def extract_sales_data(conn=None):
 def clean_dataframe(df=None):
     """Remove nulls"""
     print("Cleaning dataframe...")
-    time.sleep(6)
+    interruptible_sleep(6)
     return TaskResult(
         passed=True,
         note="Removed 50 rows with null values",
@@ -77,7 +77,7 @@ def clean_dataframe(df=None):
 def load_to_warehouse(df=None):
     """Insert into sales_daily"""
     print("Loading to warehouse...")
-    time.sleep(5)
+    interruptible_sleep(5)
     return TaskResult(
         passed=True,
         note="Successfully loaded 950 rows to BigQuery",
@@ -95,8 +95,7 @@ def load_to_warehouse(df=None):
 )
 def daily_sales_etl():
     """Daily ETL pipeline for sales data"""
-    for i in range(2):
-        conn = fetch_db_connection()
+    conn = fetch_db_connection()
     data = extract_sales_data(conn)
     clean = clean_dataframe(data)
     load_to_warehouse(clean)
@@ -110,7 +109,7 @@ def daily_sales_etl():
 def fetch_training_set():
     """Load user behavior logs"""
     print("Fetching training data...")
-    time.sleep(5)
+    interruptible_sleep(5)
     return TaskResult(
         passed=True,
         note="Loaded 50,000 training samples",
@@ -125,7 +124,7 @@ def fetch_training_set():
 def train_xgboost(data=None):
     """Train classifier on GPU"""
     print("Training model...")
-    time.sleep(20)
+    interruptible_sleep(20)
     auc_score = 0.87
     return TaskResult(
         passed=auc_score > 0.85,
@@ -142,9 +141,9 @@ def train_xgboost(data=None):
 def evaluate_model(model=None):
     """Check AUC metric"""
     print("Evaluating model...")
-    time.sleep(7)
+    interruptible_sleep(7)
     # Extract passed status from model TaskResult
-    passed = model.passed if (model and hasattr(model, 'passed')) else True
+    passed = model.passed if isinstance(model, TaskResult) else True
     return TaskResult(
         passed=passed,
         note="Model evaluation completed" if passed else "Model failed quality checks",
@@ -158,10 +157,10 @@ def evaluate_model(model=None):
 @task(estimated_time=10000)
 def deploy_if_better(passed=None):
     """Push to Sagemaker"""
-    should_deploy = passed.passed if (passed and hasattr(passed, 'passed')) else True
+    should_deploy = passed.passed if isinstance(passed, TaskResult) else True
     if should_deploy:
         print("Deploying model to production...")
-        time.sleep(10)
+        interruptible_sleep(10)
         return TaskResult(
             passed=True,
             note="Model deployed to production successfully",
@@ -201,7 +200,7 @@ def churn_model_retraining():
 def check_api_latency():
     """Ping /health endpoint"""
     print("Checking API latency...")
-    time.sleep(2)
+    interruptible_sleep(2)
     return TaskResult(
         passed=True,
         note="API health check passed - latency within normal range",
@@ -215,7 +214,7 @@ def check_api_latency():
 def check_db_pool():
     """Query connection pool"""
     print("Checking DB connection pool...")
-    time.sleep(2)
+    interruptible_sleep(2)
     return TaskResult(
         passed=True,
         note="Database connection pool healthy",
@@ -229,7 +228,7 @@ def check_db_pool():
 def check_redis_memory():
     """Check memory usage"""
     print("Checking Redis memory...")
-    time.sleep(2)
+    interruptible_sleep(2)
     return TaskResult(
         passed=True,
         note="Redis memory usage within acceptable limits",
@@ -243,7 +242,7 @@ def check_redis_memory():
 def alert_pagerduty_if_critical():
     """Trigger alerts if needed"""
     print("Evaluating alert thresholds...")
-    time.sleep(2)
+    interruptible_sleep(2)
     return TaskResult(
         passed=True,
         note="No critical alerts detected",
@@ -261,9 +260,8 @@ def alert_pagerduty_if_critical():
 )
 def infra_health_check():
     """Monitor infrastructure health metrics"""
-    check_api_latency()
-    check_db_pool()
-    check_redis_memory()
+    # The three checks are independent, so run them side by side
+    run_parallel(check_api_latency, check_db_pool, check_redis_memory)
     alert_pagerduty_if_critical()
 
 
@@ -275,7 +273,7 @@ def infra_health_check():
 def compute_kpis():
     """Aggregate revenue metrics"""
     print("Computing KPIs...")
-    time.sleep(8)
+    interruptible_sleep(8)
     return TaskResult(
         passed=True,
         note="KPIs computed successfully for current period",
@@ -291,7 +289,7 @@ def compute_kpis():
 def generate_charts(metrics=None):
     """Plot matplotlib figures"""
     print("Generating charts...")
-    time.sleep(5)
+    interruptible_sleep(5)
     return TaskResult(
         passed=True,
         note="Generated 3 visualization charts",
@@ -307,7 +305,7 @@ def generate_charts(metrics=None):
 def render_pdf(charts=None):
     """Jinja2 to WeasyPrint"""
     print("Rendering PDF report...")
-    time.sleep(10)
+    interruptible_sleep(10)
     return TaskResult(
         passed=True,
         note="PDF report rendered successfully",
@@ -321,7 +319,7 @@ def render_pdf(charts=None):
 def email_report(pdf=None):
     """Send via SendGrid"""
     print("Emailing report to executives...")
-    time.sleep(3)
+    interruptible_sleep(3)
     return TaskResult(
         passed=True,
         note="Report emailed to 5 executives",
@@ -354,8 +352,8 @@ def weekly_report():
 if __name__ == "__main__":
     # Example: Execute flows and download their reports
     print("[Perfect] Registering and executing flows...")
-    import threading
-    from perfect.sdk import download_report
+    from concurrent.futures import ThreadPoolExecutor
+    from perfect.sdk import download_report, shutdown
 
     reports_base_dir = os.path.join(os.path.dirname(__file__), 'Reports')
 
@@ -370,16 +368,17 @@ if __name__ == "__main__":
         # Download the report using SDK
         download_report(run_id, output_dir=reports_base_dir)
 
-    # Create a thread for each flow
-    threads = []
-    for flow_func in [daily_sales_etl, churn_model_retraining, infra_health_check, weekly_report]:
-        t = threading.Thread(target=execute_flow_and_download_report, args=(flow_func,))
-        t.start()
-        threads.append(t)
-
-    # Wait for all threads to complete
-    for t in threads:
-        t.join()
+    # Run every flow concurrently on a pool; exiting the block waits for all of them
+    flow_funcs = [daily_sales_etl, churn_model_retraining, infra_health_check, weekly_report]
+    with ThreadPoolExecutor(max_workers=len(flow_funcs)) as pool:
+        try:
+            # list() surfaces any exception raised by a flow
+            list(pool.map(execute_flow_and_download_report, flow_funcs))
+        except KeyboardInterrupt:
+            # Wake the tasks' interruptible_sleep() so the pool can finish now
+            print("\n[Perfect] Interrupted, stopping running flows...")
+            shutdown()
+            sys.exit(1)
 
     print("\n[Perfect] All flows completed and reports downloaded!")
 
@@ -391,3 +390,5 @@ if __name__ == "__main__":
             time.sleep(1)
     except KeyboardInterrupt:
         print("\n[Perfect] Shutting down...")
+        # Flow threads are not daemons; stop their tasks before the interpreter waits on them
+        shutdown()
@@ -126,6 +126,18 @@ export class FlowEngine {
     }
   }
 
+  /**
+   * Add a batch of log messages to a running flow (single save + notification)
+   */
+  addFlowLogs(runId: string, logs: string[]): void {
+    const run = this.runs.find(r => r.id === runId);
+    if (run && logs.length > 0) {
+      run.logs.push(...logs);
+      runDb.saveRun(run);
+      this.notifyStateChange();
+    }
+  }
+
   /**
    * Update task state for a running flow
    */
@@ -79,6 +79,36 @@ app.post('/api/flows', (req, res) => {
   }
 });
 
+// Bulk flow registration - Python client registers every decorated flow in one request
+app.post('/api/flows/bulk', (req, res) => {
+  try {
+    const { flows, autoTrigger, autoTriggerConfig } = req.body;
+    if (!Array.isArray(flows)) {
+      return res.status(400).json({ success: false, error: 'flows must be an array' });
+    }
+
+    const registered = flows.map((flowData: any) => {
+      try {
+        const flow = flowEngine.registerFlow(flowData);
+        if (autoTrigger === true) {
+          const config = autoTriggerConfig || 'development';
+          const activeClient = getActiveClient();
+          flowEngine.triggerFlow(flow.id, config, activeClient?.color, activeClient?.name);
+        }
+        return flow;
+      } catch (error: any) {
+        console.error(`[Server] Failed to register flow '${flowData?.name}': ${error.message}`);
+        return null;
+      }
+    });
+
+    console.log(`[Server] Registered ${registered.filter(Boolean).length}/${flows.length} flows in bulk (autoTrigger=${autoTrigger})`);
+    res.json({ success: true, flows: registered });
+  } catch (error: any) {
+    res.status(400).json({ success: false, error: error.message });
+  }
+});
+
 app.post('/api/flows/:runId/logs', (req, res) => {
   try {
     const { runId } = req.params;
@@ -90,6 +120,21 @@ app.post('/api/flows/:runId/logs', (req, res) => {
   }
 });
 
+// Bulk log endpoint - Python client batches log lines into a single request
+app.post('/api/flows/:runId/logs/bulk', (req, res) => {
+  try {
+    const { runId } = req.params;
+    const { logs } = req.body;
+    if (!Array.isArray(logs)) {
+      return res.status(400).json({ success: false, error: 'logs must be an array' });
+    }
+    flowEngine.addFlowLogs(runId, logs);
+    res.json({ success: true });
+  } catch (error: any) {
+    res.status(400).json({ success: false, error: error.message });
+  }
+});
+
 // Task state update endpoint
 app.post('/api/runs/:runId/tasks/:taskIndex/state', (req, res) => {
   try {
@@ -108,6 +153,29 @@ app.post('/api/runs/:runId/tasks/:taskIndex/state', (req, res) => {
   }
 });
 
+// Combined task event endpoint - optional log line plus optional task state update
+app.post('/api/runs/:runId/tasks/:taskIndex/event', (req, res) => {
+  try {
+    const { runId, taskIndex } = req.params;
+    const { log, state, progress, durationMs, result, taskName, estimatedTime, crucialPass } = req.body;
+
+    if (log !== undefined) {
+      flowEngine.addFlowLog(runId, log);
+    }
+
+    if (state !== undefined) {
+      const success = flowEngine.updateTaskState(runId, parseInt(taskIndex), state, progress, durationMs, result, taskName, estimatedTime, crucialPass);
+      if (!success) {
+        return res.status(404).json({ success: false, error: 'Run or task not found' });
+      }
+    }
+
+    res.json({ success: true });
+  } catch (error: any) {
+    res.status(400).json({ success: false, error: error.message });
+  }
+});
+
 // Flow completion endpoint - signals that client finished executing a flow
 app.post('/api/runs/:runId/complete', (req, res) => {
   try {
@@ -278,6 +346,7 @@ app.get('/api/reports/run/:runId', (req, res) => {
 });
 
 // Long-poll endpoint for Python client to receive execution requests
+// Also serves as the client heartbeat while the client is listening
 app.get('/api/execution-requests', (req, res) => {
   // Update heartbeat when client polls
   flowEngine.updateHeartbeat();
@@ -291,11 +360,15 @@ app.get('/api/execution-requests', (req, res) => {
     // Otherwise, hold the connection for long-polling (30 seconds timeout)
     pendingResponses.push(res);
 
+    // A held long-poll proves the client is alive - keep its heartbeat fresh
+    const heartbeat = setInterval(() => flowEngine.updateHeartbeat(), 3000);
+    res.on('close', () => clearInterval(heartbeat));
+
     const timeout = setTimeout(() => {
       const index = pendingResponses.indexOf(res);
       if (index > -1) {
         pendingResponses.splice(index, 1);
-        res.json(null); // Return null to signal no work available
+        res.status(204).end(); // No Content signals no work available
       }
     }, 30000); // 30 second long-poll timeout
 
@@ -66,6 +66,31 @@ router.post('/run/:flowId', (req, res) => {
   }
 });
 
+/**
+ * POST /api/engine/tasks/batch-update
+ * Apply state updates for several running tasks at once
+ * (the Python client's keep-alive dispatcher sends one per tick)
+ */
+router.post('/tasks/batch-update', (req, res) => {
+  try {
+    const { updates } = req.body;
+    if (!Array.isArray(updates)) {
+      return res.status(400).json({ success: false, error: 'updates must be an array' });
+    }
+
+    let updated = 0;
+    for (const update of updates) {
+      const { runId, taskIndex, state, progress } = update;
+      if (flowEngine.updateTaskState(runId, parseInt(taskIndex), state, progress)) {
+        updated++;
+      }
+    }
+    res.json({ success: true, updated });
+  } catch (error: any) {
+    res.status(400).json({ success: false, error: error.message });
+  }
+});
+
 /**
  * POST /api/flows
  * Register a new flow (called by Python clients)